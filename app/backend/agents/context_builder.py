@@ -32,7 +32,7 @@ def build_session_context(db: Session, player_id: int) -> dict:
     Returns:
         dict with all context data formatted for LLM consumption
     """
-    player = db.query(PlayerCharacter).filter(PlayerCharacter.id == player_id).first()
+    player = db.get(PlayerCharacter, player_id)
     if not player:
         return {"error": f"Player {player_id} not found"}
     
@@ -49,7 +49,7 @@ def build_session_context(db: Session, player_id: int) -> dict:
     
     # Current location and region
     if player.current_location_id:
-        location = db.query(Location).filter(Location.id == player.current_location_id).first()
+        location = db.get(Location, player.current_location_id)
         if location:
             context["location_name"] = location.name
             context["location_description"] = location.description
@@ -58,7 +58,7 @@ def build_session_context(db: Session, player_id: int) -> dict:
             
             # Get region info if location has one
             if location.region_id:
-                region = db.query(Region).filter(Region.id == location.region_id).first()
+                region = db.get(Region, location.region_id)
                 if region:
                     context["region_name"] = region.name
                     context["region_description"] = region.description
@@ -77,7 +77,7 @@ def build_session_context(db: Session, player_id: int) -> dict:
     
     inventory_summary = []
     for item in inventory_items:
-        template = db.query(ItemTemplate).filter(ItemTemplate.id == item.template_id).first()
+        template = db.get(ItemTemplate, item.template_id)
         item_name = item.custom_name or (template.name if template else "Unknown")
         inventory_summary.append({
             "instance_id": item.id,
@@ -121,7 +121,7 @@ def build_session_context(db: Session, player_id: int) -> dict:
         
         items_summary = []
         for item in ground_items:
-            template = db.query(ItemTemplate).filter(ItemTemplate.id == item.template_id).first()
+            template = db.get(ItemTemplate, item.template_id)
             item_name = item.custom_name or (template.name if template else "Unknown")
             items_summary.append({
                 "instance_id": item.id,
@@ -1,12 +1,13 @@
 import logging
 import uuid
-import json
+import orjson
 from typing import Optional, List, Dict, Any
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage, ToolMessage
 from langgraph.graph import StateGraph, END
 from langgraph.prebuilt import ToolNode
 
 from config import settings
+from database import tool_step_scope
 from .state import GameState
 from .tools import get_game_tools
 from .story_manager import get_story_manager
@@ -39,7 +40,7 @@ class GameMasterAgent:
             return
 
         try:
-            msg.content = json.dumps(content, ensure_ascii=False)
+            msg.content = orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS).decode()
         except TypeError:
             msg.content = str(content)
 
@@ -157,13 +158,16 @@ class GameMasterAgent:
     
     def _log_tool_results(self, state: GameState) -> dict:
         """Wrapper to log tool results."""
-        result = self.tool_node.invoke(state)
+        # The tool calls of this step share one pooled session and commit together
+        # here, before the next LLM call (no transaction stays open across it)
+        with tool_step_scope():
+            result = self.tool_node.invoke(state)
 
         for msg in result.get("messages", []):
             if isinstance(msg, ToolMessage):
                 if not isinstance(msg.content, str):
                     try:
-                        msg.content = json.dumps(msg.content, ensure_ascii=False)
+                        msg.content = orjson.dumps(msg.content, option=orjson.OPT_NON_STR_KEYS).decode()
                     except TypeError:
                         msg.content = str(msg.content)
                 if not (msg.content or "").strip():
@@ -5,8 +5,9 @@ Provides session summaries and keyword-based memory search.
 import logging
 from typing import List, Optional
 from langchain_core.messages import HumanMessage, SystemMessage
+from sqlalchemy import select, update
 
-from database import SessionLocal
+from database import session_scope
 from models import ChatSession, ChatMessage
 from config import settings
 from .prompts import MEMORY_SUMMARY_PROMPT
@@ -24,85 +25,87 @@ class MemoryManager:
             max_tokens=settings.SUMMARY_LLM_MAX_TOKENS,
         )
     
-    def _get_db(self):
-        return SessionLocal()
-    
     def generate_session_summary(self, session_id: str) -> dict:
         """Generate a summary for a session using LLM."""
-        db = self._get_db()
-        try:
-            session = db.query(ChatSession).filter(ChatSession.session_id == session_id).first()
-            if not session:
+        with session_scope() as db:
+            if db.execute(
+                select(ChatSession.id).where(ChatSession.session_id == session_id)
+            ).first() is None:
                 return {"error": f"Session {session_id} not found"}
             
             # Get all messages for this session
-            messages = db.query(ChatMessage).filter(
-                ChatMessage.session_id == session_id
-            ).order_by(ChatMessage.created_at).all()
-            
-            if len(messages) < 3:
-                return {"error": "Not enough messages to summarize (minimum 3)"}
-            
-            # Format conversation for the LLM
-            conversation_text = ""
-            for msg in messages:
-                if msg.role == "human":
-                    conversation_text += f"PLAYER: {msg.content}\n"
-                elif msg.role == "ai":
-                    conversation_text += f"GAME MASTER: {msg.content}\n"
-            
-            # Generate summary using LLM
-            response = self.summary_llm.invoke([
-                SystemMessage(content="You are a helpful assistant that summarizes RPG game sessions."),
-                HumanMessage(content=MEMORY_SUMMARY_PROMPT.format(conversation=conversation_text[:8000])),
-            ])
-            
-            result_text = response.content
-            
-            # Parse the response
-            title = ""
-            summary = ""
-            keywords = ""
-            
-            for line in result_text.split("\n"):
-                line = line.strip()
-                if line.startswith("TITLE:"):
-                    title = line[6:].strip()
-                elif line.startswith("SUMMARY:"):
-                    summary = line[8:].strip()
-                elif line.startswith("KEYWORDS:"):
-                    keywords = line[9:].strip()
-            
-            # Update the session
-            session.title = title
-            session.summary = summary
-            session.keywords = keywords.lower()  # Lowercase for easier search
-            db.commit()
-            
-            logger.info(f"[MEMORY] Generated summary for session {session_id}: {title}")
-            
-            return {
-                "session_id": session_id,
-                "title": title,
-                "summary": summary,
-                "keywords": keywords,
-                "message_count": len(messages)
-            }
-        finally:
-            db.close()
+            messages = db.execute(
+                select(ChatMessage.role, ChatMessage.content)
+                .where(ChatMessage.session_id == session_id)
+                .order_by(ChatMessage.created_at)
+            ).all()
+        
+        if len(messages) < 3:
+            return {"error": "Not enough messages to summarize (minimum 3)"}
+        
+        # Format conversation for the LLM
+        conversation_text = ""
+        for msg in messages:
+            if msg.role == "human":
+                conversation_text += f"PLAYER: {msg.content}\n"
+            elif msg.role == "ai":
+                conversation_text += f"GAME MASTER: {msg.content}\n"
+        
+        # Generate summary using LLM (no connection is held while it runs)
+        response = self.summary_llm.invoke([
+            SystemMessage(content="You are a helpful assistant that summarizes RPG game sessions."),
+            HumanMessage(content=MEMORY_SUMMARY_PROMPT.format(conversation=conversation_text[:8000])),
+        ])
+        
+        result_text = response.content
+        
+        # Parse the response
+        title = ""
+        summary = ""
+        keywords = ""
+        
+        for line in result_text.split("\n"):
+            line = line.strip()
+            if line.startswith("TITLE:"):
+                title = line[6:].strip()
+            elif line.startswith("SUMMARY:"):
+                summary = line[8:].strip()
+            elif line.startswith("KEYWORDS:"):
+                keywords = line[9:].strip()
+        
+        # Update the session
+        with session_scope() as db:
+            db.execute(
+                update(ChatSession)
+                .where(ChatSession.session_id == session_id)
+                .values(title=title, summary=summary,
+                        keywords=keywords.lower())  # Lowercase for easier search
+            )
+        
+        logger.info(f"[MEMORY] Generated summary for session {session_id}: {title}")
+        
+        return {
+            "session_id": session_id,
+            "title": title,
+            "summary": summary,
+            "keywords": keywords,
+            "message_count": len(messages)
+        }
     
     def search_memories(self, player_id: int, query: str, limit: int = 5) -> List[dict]:
         """Search through session summaries and keywords for relevant memories.
         
         Uses simple keyword matching against session keywords and summaries.
         """
-        db = self._get_db()
-        try:
-            # Get all sessions with summaries for this player
-            sessions = db.query(ChatSession).filter(
-                ChatSession.player_id == player_id,
-                ChatSession.summary.isnot(None)
-            ).order_by(ChatSession.last_active.desc()).all()
+        # Joins the tool step's shared session when called from a GM tool
+        with session_scope(read_only=True) as db:
+            # Get all sessions with summaries for this player (plain rows, only the scored columns)
+            sessions = db.execute(
+                select(ChatSession.session_id, ChatSession.title, ChatSession.summary,
+                       ChatSession.keywords, ChatSession.last_active)
+                .where(ChatSession.player_id == player_id, ChatSession.summary.isnot(None))
+                .order_by(ChatSession.last_active.desc())
+            ).all()
             
             if not sessions:
                 return []
@@ -157,13 +160,10 @@ class MemoryManager:
             
             logger.info(f"[MEMORY] Search for '{query}' found {len(results)} relevant memories")
             return results
-        finally:
-            db.close()
     
     def get_session_details(self, session_id: str, message_limit: int = 20) -> dict:
         """Get full details of a session including recent messages."""
-        db = self._get_db()
-        try:
+        with session_scope(read_only=True) as db:
             session = db.query(ChatSession).filter(ChatSession.session_id == session_id).first()
             if not session:
                 return {"error": f"Session {session_id} not found"}
@@ -187,17 +187,16 @@ class MemoryManager:
                     if msg.role in ("human", "ai")
                 ]
             }
-        finally:
-            db.close()
     
     def get_all_player_memories(self, player_id: int) -> List[dict]:
         """Get all summarized sessions for a player."""
-        db = self._get_db()
-        try:
-            sessions = db.query(ChatSession).filter(
-                ChatSession.player_id == player_id,
-                ChatSession.summary.isnot(None)
-            ).order_by(ChatSession.last_active.desc()).all()
+        with session_scope(read_only=True) as db:
+            sessions = db.execute(
+                select(ChatSession.session_id, ChatSession.title, ChatSession.summary,
+                       ChatSession.keywords, ChatSession.last_active)
+                .where(ChatSession.player_id == player_id, ChatSession.summary.isnot(None))
+                .order_by(ChatSession.last_active.desc())
+            ).all()
             
             return [
                 {
@@ -209,8 +208,6 @@ class MemoryManager:
                 }
                 for s in sessions
             ]
-        finally:
-            db.close()
 
 
 # Singleton instance
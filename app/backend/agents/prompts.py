@@ -36,7 +36,7 @@ GAME_MASTER_SYSTEM_PROMPT = """You are the Game Master for an immersive fantasy
 **Every time** the narrative involves any of the following, you MUST call the corresponding tool — do NOT just narrate it:
 - **Gold changes** (buying, selling, looting, paying, tipping) → `update_player_gold`
 - **Health changes** (healing, damage, resting) → `update_player_health`
-- **Item acquisition** (buying, finding, receiving) → `create_item_for_player` or `pickup_item`
+- **Item acquisition** (buying, finding, receiving) → `create_item_for_player` (several at once: `create_items_for_player`) or `pickup_item`
 - **Item consumption** (eating, drinking potions, using bandages) → `consume_item_instance`
 - **Item transfer** (giving to NPC, dropping) → `transfer_item` or `drop_item`
 - **Experience gains** (completing tasks, overcoming challenges) → `update_player_experience`
@@ -32,7 +32,7 @@ class StoryManager:
         """
         db = self._get_db()
         try:
-            player = db.query(PlayerCharacter).filter(PlayerCharacter.id == player_id).first()
+            player = db.get(PlayerCharacter, player_id)
             if not player or not player.story_messages:
                 return []
             
@@ -58,7 +58,7 @@ class StoryManager:
         """
         db = self._get_db()
         try:
-            player = db.query(PlayerCharacter).filter(PlayerCharacter.id == player_id).first()
+            player = db.get(PlayerCharacter, player_id)
             if not player:
                 raise ValueError(f"Player {player_id} not found")
             
@@ -102,7 +102,7 @@ class StoryManager:
         """Clear all messages for a player. Returns count deleted."""
         db = self._get_db()
         try:
-            player = db.query(PlayerCharacter).filter(PlayerCharacter.id == player_id).first()
+            player = db.get(PlayerCharacter, player_id)
             if not player:
                 return 0
             
@@ -128,7 +128,7 @@ class StoryManager:
         """
         db = self._get_db()
         try:
-            player = db.query(PlayerCharacter).filter(PlayerCharacter.id == player_id).first()
+            player = db.get(PlayerCharacter, player_id)
             if not player or not player.story_messages:
                 return False
             
@@ -149,7 +149,8 @@ class StoryManager:
         return [m for m in messages if tag in m.get("tags", [])]
     
     def compress_tagged_messages(self, player_id: int, tag: str, 
-                                  summary: str, summary_tags: Optional[List[str]] = None) -> int:
+                                  summary: str, summary_tags: Optional[List[str]] = None,
+                                  db: Optional[Session] = None) -> int:
         """Replace all messages with a specific tag with a single summary message.
         
         Useful for combat compression: all 'combat:123' tagged messages → one summary.
@@ -159,47 +160,58 @@ class StoryManager:
             tag: Tag to match (e.g., 'combat:123')
             summary: Summary content to replace with
             summary_tags: Tags for the summary message
+            db: Session to run in (e.g. the tool's own); the caller commits it.
+                Without one, a new session is opened and committed here.
         
         Returns:
             Number of messages replaced
         """
+        if db is not None:
+            return self._compress_tagged_messages(db, player_id, tag, summary, summary_tags)
+        
         db = self._get_db()
         try:
-            player = db.query(PlayerCharacter).filter(PlayerCharacter.id == player_id).first()
-            if not player or not player.story_messages:
-                return 0
-            
-            messages = list(player.story_messages)
-            
-            # Find messages with this tag
-            tagged_indices = [i for i, m in enumerate(messages) if tag in m.get("tags", [])]
-            if not tagged_indices:
-                return 0
-            
-            # Get position of first tagged message
-            first_idx = tagged_indices[0]
-            
-            # Remove tagged messages (reverse order to preserve indices)
-            for idx in reversed(tagged_indices):
-                messages.pop(idx)
-            
-            # Insert summary at original position
-            summary_msg = {
-                "role": "gm",
-                "content": summary,
-                "tags": summary_tags or [f"{tag}:summary"],
-                "timestamp": datetime.utcnow().isoformat()
-            }
-            messages.insert(first_idx, summary_msg)
-            
-            player.story_messages = messages
-            db.commit()
-            
-            replaced = len(tagged_indices)
-            logger.info(f"[STORY] Compressed {replaced} messages with tag '{tag}' for player {player_id}")
+            replaced = self._compress_tagged_messages(db, player_id, tag, summary, summary_tags)
+            if replaced:
+                db.commit()
             return replaced
         finally:
             db.close()
+    
+    def _compress_tagged_messages(self, db: Session, player_id: int, tag: str,
+                                  summary: str, summary_tags: Optional[List[str]]) -> int:
+        player = db.get(PlayerCharacter, player_id)
+        if not player or not player.story_messages:
+            return 0
+        
+        messages = list(player.story_messages)
+        
+        # Find messages with this tag
+        tagged_indices = [i for i, m in enumerate(messages) if tag in m.get("tags", [])]
+        if not tagged_indices:
+            return 0
+        
+        # Get position of first tagged message
+        first_idx = tagged_indices[0]
+        
+        # Remove tagged messages (reverse order to preserve indices)
+        for idx in reversed(tagged_indices):
+            messages.pop(idx)
+        
+        # Insert summary at original position
+        summary_msg = {
+            "role": "gm",
+            "content": summary,
+            "tags": summary_tags or [f"{tag}:summary"],
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        messages.insert(first_idx, summary_msg)
+        
+        player.story_messages = messages
+        
+        replaced = len(tagged_indices)
+        logger.info(f"[STORY] Compressed {replaced} messages with tag '{tag}' for player {player_id}")
+        return replaced
 
 
 # Singleton instance
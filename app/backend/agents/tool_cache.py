@@ -0,0 +1,149 @@
+"""
+In-process caches for world data the GM tools re-read constantly but rarely change
+(item templates, regions).
+
+Edits through the ORM (tools, REST routes) drop the affected keys at once and
+again on commit (drop_on_commit); the TTL only bounds staleness after raw SQL or
+another process's edits. A session with uncommitted writes reads around these
+caches (load_committed), so rows it wrote are never cached before they commit.
+
+Read-only tools can also memoize their whole result for a couple of seconds with
+@cached_result: the LLM often repeats e.g. get_player_info(1) within one turn.
+Those results are dropped as soon as any session writes to the database, commits
+or rolls back a write; a tool step whose session holds uncommitted writes neither
+reads nor fills the cache, so other requests never see another step's pending state.
+"""
+import functools
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session, sessionmaker
+
+from database import current_step_session
+
+
+class TTLCache:
+    """Thread-safe key/value cache whose entries expire after `ttl` seconds."""
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the cached value for key, calling loader() on a miss.
+
+        None results (e.g. row not found) are not cached.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+
+        value = loader()
+        if value is not None:
+            with self._lock:
+                self._entries[key] = (now + self.ttl, value)
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one key, or everything when key is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+# Results of read-only tools, keyed by (tool name, arguments)
+tool_results = TTLCache(ttl=2.0)
+
+
+def load_committed(cache: TTLCache, session: Optional[Session], key: Hashable,
+                   loader: Callable[[], Any]) -> Any:
+    """cache.get_or_load for a loader that reads through session (if not None).
+
+    A session holding uncommitted writes (see invalidate_on_write) loads without
+    the cache: its pending rows must not be served to other sessions, nor kept
+    after a rollback.
+    """
+    if session is not None and session.info.get("wrote"):
+        return loader()
+    return cache.get_or_load(key, loader)
+
+
+def drop_on_commit(session: Optional[Session], cache: TTLCache,
+                   key: Optional[Hashable] = None) -> None:
+    """Drop a cache key now and again when session's transaction commits.
+
+    Until then other sessions still read the old committed row and may cache it
+    again; the second drop discards that entry.
+    """
+    cache.invalidate(key)
+    if session is not None:
+        session.info.setdefault("drop_on_commit", set()).add((cache, key))
+
+
+def cached_result(fn: Callable) -> Callable:
+    """Memoize a read-only tool's result in tool_results (apply below @tool)."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        # After a write, the step's session sees its own uncommitted rows: bypass the
+        # process-wide cache until the step commits or rolls back
+        step_db = current_step_session()
+        if step_db is not None and step_db.info.get("wrote"):
+            return fn(*args, **kwargs)
+        key = (fn.__name__, args, frozenset(kwargs.items()))
+        return tool_results.get_or_load(key, lambda: fn(*args, **kwargs))
+    return wrapper
+
+
+def invalidate_on_write(session_factory: sessionmaker) -> None:
+    """Drop all cached tool results whenever a session from the factory writes.
+
+    Results are dropped when the write is issued (so later reads in the same
+    transaction don't see stale data) and again on commit, in case another
+    thread re-cached the old rows in between. A rollback of a session that wrote
+    (the whole transaction or a SAVEPOINT) drops them too. Keys registered with
+    drop_on_commit() are dropped on commit as well.
+    """
+    def mark_written(session: Session) -> None:
+        session.info["wrote"] = True
+        tool_results.invalidate()
+
+    @event.listens_for(session_factory, "after_flush")
+    def _after_flush(session, flush_context):
+        mark_written(session)
+
+    @event.listens_for(session_factory, "do_orm_execute")
+    def _on_execute(state: ORMExecuteState):
+        if state.is_insert or state.is_update or state.is_delete:
+            mark_written(state.session)
+
+    # after_commit and after_rollback also fire when a SAVEPOINT ends, while the
+    # enclosing transaction may still hold earlier, uncommitted writes
+    @event.listens_for(session_factory, "after_commit")
+    def _after_commit(session):
+        if session.info.get("wrote"):
+            tool_results.invalidate()
+        for cache, key in session.info.get("drop_on_commit", ()):
+            cache.invalidate(key)
+
+    @event.listens_for(session_factory, "after_rollback")
+    def _after_rollback(session):
+        if session.info.get("wrote"):
+            tool_results.invalidate()
+
+    @event.listens_for(session_factory, "after_soft_rollback")
+    def _after_soft_rollback(session, previous_transaction):
+        if session.info.get("wrote"):
+            tool_results.invalidate()
+
+    @event.listens_for(session_factory, "after_transaction_end")
+    def _after_transaction_end(session, transaction):
+        if transaction.parent is None:
+            session.info.pop("wrote", None)
+            session.info.pop("drop_on_commit", None)
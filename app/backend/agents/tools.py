@@ -1,71 +1,269 @@
 from typing import Optional, List
 from langchain_core.tools import tool
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, case, column, delete, event, func, insert, literal, literal_column, or_, select, union_all, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import JSONB, aggregate_order_by, insert as pg_insert
+from sqlalchemy.orm import Session, aliased, joinedload, object_session, raiseload
+from sqlalchemy.orm.attributes import flag_modified
 
 from datetime import datetime
-from database import SessionLocal
+from database import SessionLocal, current_step_session, session_scope
 from models import (
     PlayerCharacter, NonPlayerCharacter, Location, Quest,
     ItemTemplate, ItemInstance, Race, Faction,
     CharacterRelationship, CharacterType, OwnerType,
     Region, ClimateType, WealthLevel, DangerLevel,
-    RaceRelationship, CombatSession
+    RaceRelationship, CombatSession,
+    BehaviorState, ItemCategory, ItemRarity
 )
 from agents.story_manager import get_story_manager
+from agents.memory_manager import get_memory_manager
+from agents.tool_cache import (
+    TTLCache, cached_result, drop_on_commit, invalidate_on_write, load_committed
+)
 
 
-def get_db():
-    """Get database session for tools."""
-    db = SessionLocal()
-    try:
-        return db
-    finally:
-        pass
+# Item templates, regions and races are world-building data: written rarely, read by most tools
+_template_cache = TTLCache(ttl=300)
+_region_cache = TTLCache(ttl=300)
+# Whole-table listings ("races", "regions"), dropped when a row of the table is written
+_listing_cache = TTLCache(ttl=300)
+
+# String -> enum member lookups for tool arguments, built once at import
+_ENUM_LOOKUPS = {
+    enum_cls: {m.value: m for m in enum_cls}
+    for enum_cls in (OwnerType, WealthLevel, ClimateType, DangerLevel,
+                     CharacterType, BehaviorState, ItemCategory, ItemRarity)
+}
+
+# Enum member -> its string value, for serializing listing rows with one dict probe each
+_ENUM_VALUES = {
+    member: value for lookup in _ENUM_LOOKUPS.values() for value, member in lookup.items()
+}
+
+
+def _enum_or_default(enum_cls, value: Optional[str], default=None):
+    """Enum member for value, or default when it isn't a valid value (no exception raised)."""
+    return _ENUM_LOOKUPS[enum_cls].get(value, default)
+
+
+def _substring_pattern(search: str) -> str:
+    """ILIKE pattern matching search literally anywhere (use with escape="\\")."""
+    escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _canon(src_type: CharacterType, src_id: int, tgt_type: CharacterType, tgt_id: int) -> tuple:
+    """Canonical (src_type, src_id, tgt_type, tgt_id) of a relationship pair.
+
+    PC always first, or lower ID first if same type.
+    """
+    if (src_type == CharacterType.NPC and tgt_type == CharacterType.PC) or (
+            src_type == tgt_type and src_id > tgt_id):
+        return tgt_type, tgt_id, src_type, src_id
+    return src_type, src_id, tgt_type, tgt_id
+
+
+# Template, region and race edits through any ORM session (e.g. the /item-templates, /regions
+# and /races routes) drop the cached entries at once and on commit; the TTL only bounds
+# staleness after raw SQL or another process's edits
+@event.listens_for(ItemTemplate, "after_update")
+@event.listens_for(ItemTemplate, "after_delete")
+def _drop_cached_template(mapper, connection, target):
+    drop_on_commit(object_session(target), _template_cache, target.id)
+
+
+@event.listens_for(Region, "after_insert")
+@event.listens_for(Region, "after_update")
+@event.listens_for(Region, "after_delete")
+def _drop_cached_region(mapper, connection, target):
+    session = object_session(target)
+    drop_on_commit(session, _region_cache, target.id)
+    drop_on_commit(session, _listing_cache, "regions")
+
+
+@event.listens_for(Race, "after_insert")
+@event.listens_for(Race, "after_update")
+@event.listens_for(Race, "after_delete")
+def _drop_cached_races(mapper, connection, target):
+    drop_on_commit(object_session(target), _listing_cache, "races")
+
+
+# Any write through SessionLocal drops the memoized read-tool results (@cached_result),
+# and a session with uncommitted writes never fills the caches (load_committed)
+invalidate_on_write(SessionLocal)
+
+
+def get_template_cached(db: Session, template_id: int) -> Optional[dict]:
+    """Get {id, name, category, rarity} for an item template, cached by id."""
+    def load():
+        t = db.execute(
+            select(ItemTemplate.id, ItemTemplate.name, ItemTemplate.category, ItemTemplate.rarity)
+            .where(ItemTemplate.id == template_id)
+        ).first()
+        if not t:
+            return None
+        return {
+            "id": t.id,
+            "name": t.name,
+            "category": t.category.value,
+            "rarity": t.rarity.value if t.rarity else "common"
+        }
+    return load_committed(_template_cache, db, template_id, load)
+
+
+def get_region_cached(db: Session, region_id: int) -> Optional[dict]:
+    """Get a region's descriptive fields (everything but its locations), cached by id."""
+    def load():
+        region = db.get(Region, region_id)
+        if not region:
+            return None
+        return {
+            "id": region.id,
+            "name": region.name,
+            "description": region.description,
+            "dominant_races": region.dominant_race_description,
+            "wealth_level": region.wealth_level.value if region.wealth_level else None,
+            "wealth_description": region.wealth_description,
+            "climate": region.climate.value if region.climate else None,
+            "terrain": region.terrain_description,
+            "political": region.political_description,
+            "danger_level": region.danger_level.value if region.danger_level else None,
+            "threats": region.threats_description,
+            "history": region.history_description,
+            "notable_features": region.notable_features
+        }
+    return load_committed(_region_cache, db, region_id, load)
+
+
+def _item_name(db: Session, custom_name: Optional[str], template_id: int,
+               default: str = "Unknown") -> str:
+    """Display name of an item instance; the template is only consulted without a custom name."""
+    if custom_name:
+        return custom_name
+    template = get_template_cached(db, template_id)
+    return template["name"] if template else default
+
+
+def _item_instance_exists(db: Session, item_instance_id: int) -> bool:
+    """Tell "no such item" apart from a failed guard after a guarded UPDATE matched no row."""
+    return db.execute(
+        select(ItemInstance.id).where(ItemInstance.id == item_instance_id)
+    ).first() is not None
+
+
+def _insert_item_if_exists(db: Session, parent, parent_id: int, **values) -> Optional[tuple]:
+    """INSERT an item instance only if its parent row (owner NPC or location) exists.
+
+    The parent check rides in the INSERT ... SELECT instead of a SELECT before it.
+    Returns (instance_id, parent name), or None when there is no such parent.
+    """
+    columns = ItemInstance.__table__.c
+    source = select(
+        *(literal(value, columns[key].type) for key, value in values.items())
+    ).where(parent.id == parent_id)
+    return db.execute(
+        insert(ItemInstance)
+        .from_select(list(values), source)
+        .returning(ItemInstance.id,
+                   select(parent.name).where(parent.id == parent_id).scalar_subquery())
+    ).first()
+
+
+def _move_item(db: Session, criteria: tuple, owner_type: OwnerType, owner_id: Optional[int] = None,
+               location_id: Optional[int] = None, returning: tuple = ()):
+    """Give the item instance(s) matching criteria to a new owner, or to the ground at location_id.
+
+    Shared by transfer_item, pickup_item and drop_item: one UPDATE whose WHERE criteria carry
+    the caller's guard (e.g. "on the ground"), unequipping the item. Returns the row
+    (id, quantity, custom_name, template_id, *returning), or None when nothing matched.
+    """
+    on_ground = owner_type == OwnerType.NONE
+    return db.execute(
+        update(ItemInstance)
+        .where(*criteria)
+        .values(
+            owner_type=owner_type,
+            owner_id=None if on_ground else owner_id,
+            location_id=location_id if on_ground else None,
+            is_equipped=False
+        )
+        .returning(ItemInstance.id, ItemInstance.quantity, ItemInstance.custom_name,
+                   ItemInstance.template_id, *returning)
+    ).first()
+
+
+# Statements of the hottest info tools, built once at import; calls only bind parameters
+
+# Player with race, faction and location in one SELECT (skips story_messages)
+_PLAYER_INFO_STMT = (
+    select(PlayerCharacter.id, PlayerCharacter.name, PlayerCharacter.character_class,
+           PlayerCharacter.level, PlayerCharacter.health, PlayerCharacter.max_health,
+           PlayerCharacter.experience, PlayerCharacter.gold, PlayerCharacter.description,
+           PlayerCharacter.reputation,
+           Race.id.label("race_id"), Race.name.label("race_name"),
+           Faction.id.label("faction_id"), Faction.name.label("faction_name"),
+           Location.id.label("location_id"), Location.name.label("location_name"),
+           Location.description.label("location_description"))
+    .outerjoin(Race, Race.id == PlayerCharacter.race_id)
+    .outerjoin(Faction, Faction.id == PlayerCharacter.primary_faction_id)
+    .outerjoin(Location, Location.id == PlayerCharacter.current_location_id)
+    .where(PlayerCharacter.id == bindparam("player_id"))
+)
+
+# Inventory rows with their template columns (inner join skips orphaned items)
+_PLAYER_INVENTORY_STMT = (
+    select(ItemInstance.id, ItemInstance.custom_name, ItemInstance.is_equipped,
+           ItemInstance.quantity, ItemTemplate.name, ItemTemplate.category)
+    .join(ItemTemplate, ItemTemplate.id == ItemInstance.template_id)
+    .where(ItemInstance.owner_type == OwnerType.PC,
+           ItemInstance.owner_id == bindparam("player_id"))
+)
+
+# NPC with race, faction and location in one SELECT
+_NPC_INFO_STMT = (
+    select(NonPlayerCharacter,
+           Race.name.label("race_name"),
+           Faction.name.label("faction_name"), Faction.alignment.label("faction_alignment"),
+           Location.name.label("location_name"))
+    .outerjoin(Race, Race.id == NonPlayerCharacter.race_id)
+    .outerjoin(Faction, Faction.id == NonPlayerCharacter.faction_id)
+    .outerjoin(Location, Location.id == NonPlayerCharacter.location_id)
+    .where(NonPlayerCharacter.id == bindparam("npc_id"))
+)
 
 
 @tool
+@cached_result
 def get_player_info(player_id: int) -> dict:
     """Get detailed information about a player character including their stats, inventory, and current location."""
-    db = SessionLocal()
-    try:
-        player = db.query(PlayerCharacter).filter(PlayerCharacter.id == player_id).first()
+    with session_scope(read_only=True) as db:
+        player = db.execute(_PLAYER_INFO_STMT, {"player_id": player_id}).first()
         if not player:
             return {"error": f"Player with id {player_id} not found"}
         
         location = None
-        if player.current_location_id:
-            loc = db.query(Location).filter(Location.id == player.current_location_id).first()
-            if loc:
-                location = {"id": loc.id, "name": loc.name, "description": loc.description}
+        if player.location_id:
+            location = {"id": player.location_id, "name": player.location_name,
+                        "description": player.location_description}
         
         race = None
         if player.race_id:
-            r = db.query(Race).filter(Race.id == player.race_id).first()
-            if r:
-                race = {"id": r.id, "name": r.name}
+            race = {"id": player.race_id, "name": player.race_name}
         
         faction = None
-        if player.primary_faction_id:
-            f = db.query(Faction).filter(Faction.id == player.primary_faction_id).first()
-            if f:
-                faction = {"id": f.id, "name": f.name}
+        if player.faction_id:
+            faction = {"id": player.faction_id, "name": player.faction_name}
         
-        items = db.query(ItemInstance).filter(
-            ItemInstance.owner_type == OwnerType.PC,
-            ItemInstance.owner_id == player_id
-        ).all()
+        items = db.execute(_PLAYER_INVENTORY_STMT, {"player_id": player_id})
         
-        inventory = []
-        for item in items:
-            template = db.query(ItemTemplate).filter(ItemTemplate.id == item.template_id).first()
-            if template:
-                inventory.append({
-                    "instance_id": item.id,
-                    "name": item.custom_name or template.name,
-                    "category": template.category.value,
-                    "equipped": item.is_equipped,
-                    "quantity": item.quantity
-                })
+        inventory = [{
+            "instance_id": item.id,
+            "name": item.custom_name or item.name,
+            "category": item.category.value,
+            "equipped": item.is_equipped,
+            "quantity": item.quantity
+        } for item in items]
         
         return {
             "id": player.id,
@@ -83,20 +281,18 @@ def get_player_info(player_id: int) -> dict:
             "inventory": inventory,
             "reputation": player.reputation or {}
         }
-    finally:
-        db.close()
 
 
 @tool
+@cached_result
 def get_location_info(location_id: int) -> dict:
     """Get information about a location including NPCs and items present there."""
-    db = SessionLocal()
-    try:
-        location = db.query(Location).filter(Location.id == location_id).first()
+    with session_scope(read_only=True) as db:
+        location = db.get(Location, location_id)
         if not location:
             return {"error": f"Location with id {location_id} not found"}
         
-        npcs = db.query(NonPlayerCharacter).filter(
+        npcs = db.query(NonPlayerCharacter).options(raiseload('*')).filter(
             NonPlayerCharacter.location_id == location_id
         ).all()
         
@@ -104,17 +300,20 @@ def get_location_info(location_id: int) -> dict:
             "id": npc.id,
             "name": npc.name,
             "type": npc.npc_type,
-            "behavior": npc.behavior_state.value if npc.behavior_state else "passive"
+            "behavior": _ENUM_VALUES.get(npc.behavior_state, "passive")
         } for npc in npcs]
         
-        items = db.query(ItemInstance).filter(
+        items = db.query(ItemInstance).options(
+            # Templates are joined into the same SELECT; any other lazy load raises
+            joinedload(ItemInstance.template), raiseload('*')
+        ).filter(
             ItemInstance.location_id == location_id,
             ItemInstance.owner_type == OwnerType.NONE
         ).all()
         
         item_list = []
         for item in items:
-            template = db.query(ItemTemplate).filter(ItemTemplate.id == item.template_id).first()
+            template = item.template
             if template:
                 item_list.append({
                     "instance_id": item.id,
@@ -130,36 +329,30 @@ def get_location_info(location_id: int) -> dict:
             "npcs": npc_list,
             "items_on_ground": item_list
         }
-    finally:
-        db.close()
 
 
 @tool
+@cached_result
 def get_npc_info(npc_id: int) -> dict:
     """Get detailed information about an NPC including their personality and relationship with players."""
-    db = SessionLocal()
-    try:
-        npc = db.query(NonPlayerCharacter).filter(NonPlayerCharacter.id == npc_id).first()
-        if not npc:
+    with session_scope(read_only=True) as db:
+        row = db.execute(_NPC_INFO_STMT, {"npc_id": npc_id}).first()
+        if not row:
             return {"error": f"NPC with id {npc_id} not found"}
+        npc = row.NonPlayerCharacter
         
         race = None
-        if npc.race_id:
-            r = db.query(Race).filter(Race.id == npc.race_id).first()
-            if r:
-                race = {"id": r.id, "name": r.name}
+        if row.race_name is not None:
+            race = {"id": npc.race_id, "name": row.race_name}
         
         faction = None
-        if npc.faction_id:
-            f = db.query(Faction).filter(Faction.id == npc.faction_id).first()
-            if f:
-                faction = {"id": f.id, "name": f.name, "alignment": f.alignment.value if f.alignment else "neutral"}
+        if row.faction_name is not None:
+            faction = {"id": npc.faction_id, "name": row.faction_name,
+                       "alignment": row.faction_alignment.value if row.faction_alignment else "neutral"}
         
         location = None
-        if npc.location_id:
-            loc = db.query(Location).filter(Location.id == npc.location_id).first()
-            if loc:
-                location = {"id": loc.id, "name": loc.name}
+        if row.location_name is not None:
+            location = {"id": npc.location_id, "name": row.location_name}
         
         return {
             "id": npc.id,
@@ -176,8 +369,6 @@ def get_npc_info(npc_id: int) -> dict:
             "location": location,
             "personality_traits": npc.personality_traits or {}
         }
-    finally:
-        db.close()
 
 
 @tool
@@ -187,17 +378,11 @@ def get_relationship(source_type: str, source_id: int, target_type: str, target_
     NOT for racial relationships - use get_race_relationships() for that.
     Types: 'PC' or 'NPC'
     """
-    db = SessionLocal()
-    try:
-        src_type = CharacterType.PC if source_type.upper() == "PC" else CharacterType.NPC
-        tgt_type = CharacterType.PC if target_type.upper() == "PC" else CharacterType.NPC
+    with session_scope(read_only=True) as db:
+        src_type = _enum_or_default(CharacterType, source_type.upper(), CharacterType.NPC)
+        tgt_type = _enum_or_default(CharacterType, target_type.upper(), CharacterType.NPC)
         
-        # Normalize direction: PC always first, or lower ID first if same type
-        if src_type == CharacterType.NPC and tgt_type == CharacterType.PC:
-            src_type, tgt_type = tgt_type, src_type
-            source_id, target_id = target_id, source_id
-        elif src_type == tgt_type and source_id > target_id:
-            source_id, target_id = target_id, source_id
+        src_type, source_id, tgt_type, target_id = _canon(src_type, source_id, tgt_type, target_id)
         
         rel = db.query(CharacterRelationship).filter(
             CharacterRelationship.source_character_type == src_type,
@@ -220,10 +405,8 @@ def get_relationship(source_type: str, source_id: int, target_type: str, target_
             "relationship_value": rel.relationship_value,
             "relationship_type": rel.relationship_type.value if rel.relationship_type else "neutral",
             "notes": rel.notes,
-            "last_interaction": str(rel.last_interaction) if rel.last_interaction else None
+            "last_interaction": rel.last_interaction.isoformat() if rel.last_interaction else None
         }
-    finally:
-        db.close()
 
 
 @tool
@@ -234,77 +417,72 @@ def update_relationship(source_type: str, source_id: int, target_type: str, targ
     NOT for racial relationships - use update_race_relationship() for that.
     value_change is added to current (-100 to +100 range). Types: 'PC' or 'NPC'
     """
-    db = SessionLocal()
-    try:
-        src_type = CharacterType.PC if source_type.upper() == "PC" else CharacterType.NPC
-        tgt_type = CharacterType.PC if target_type.upper() == "PC" else CharacterType.NPC
-        
-        # Normalize direction: PC always first, or lower ID first if same type
-        if src_type == CharacterType.NPC and tgt_type == CharacterType.PC:
-            # Swap: PC should be source
-            src_type, tgt_type = tgt_type, src_type
-            source_id, target_id = target_id, source_id
-        elif src_type == tgt_type and source_id > target_id:
-            # Swap: lower ID first
-            source_id, target_id = target_id, source_id
-        
-        # Check for existing relationship in canonical direction
-        rel = db.query(CharacterRelationship).filter(
-            CharacterRelationship.source_character_type == src_type,
-            CharacterRelationship.source_character_id == source_id,
-            CharacterRelationship.target_character_type == tgt_type,
-            CharacterRelationship.target_character_id == target_id
-        ).first()
+    with session_scope() as db:
+        src_type = _enum_or_default(CharacterType, source_type.upper(), CharacterType.NPC)
+        tgt_type = _enum_or_default(CharacterType, target_type.upper(), CharacterType.NPC)
+        
+        src_type, source_id, tgt_type, target_id = _canon(src_type, source_id, tgt_type, target_id)
+        
+        # Insert the canonical pair or add to its value, in one round trip (clamped in SQL)
+        stmt = pg_insert(CharacterRelationship).values(
+            source_character_type=src_type,
+            source_character_id=source_id,
+            target_character_type=tgt_type,
+            target_character_id=target_id,
+            relationship_value=max(-100, min(100, value_change)),
+            notes=notes or None
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                CharacterRelationship.source_character_type,
+                CharacterRelationship.source_character_id,
+                CharacterRelationship.target_character_type,
+                CharacterRelationship.target_character_id
+            ],
+            set_={
+                "relationship_value": func.greatest(-100, func.least(
+                    100, CharacterRelationship.relationship_value + value_change)),
+                "notes": func.coalesce(stmt.excluded.notes, CharacterRelationship.notes),
+                "last_interaction": func.now()
+            }
+        ).returning(
+            CharacterRelationship,
+            # xmax is 0 only on a row version created by this INSERT
+            literal_column("xmax = 0").label("created")
+        )
+        # populate_existing refreshes the pair if this step's session already holds it
+        rel, created = db.execute(stmt, execution_options={"populate_existing": True}).one()
         
-        if rel:
-            new_value = max(-100, min(100, rel.relationship_value + value_change))
-            rel.relationship_value = new_value
-            if notes:
-                rel.notes = notes
-            db.commit()
-            return {"updated": True, "new_value": new_value}
-        else:
-            new_value = max(-100, min(100, value_change))
-            new_rel = CharacterRelationship(
-                source_character_type=src_type,
-                source_character_id=source_id,
-                target_character_type=tgt_type,
-                target_character_id=target_id,
-                relationship_value=new_value,
-                notes=notes
-            )
-            db.add(new_rel)
-            db.commit()
-            return {"created": True, "new_value": new_value}
-    finally:
-        db.close()
+        if created:
+            return {"created": True, "new_value": rel.relationship_value}
+        return {"updated": True, "new_value": rel.relationship_value}
 
 
 @tool
+@cached_result
 def get_player_quests(player_id: int) -> List[dict]:
     """Get all quests associated with a player character."""
-    db = SessionLocal()
-    try:
-        quests = db.query(Quest).filter(Quest.player_id == player_id).all()
-        return [{
-            "id": q.id,
-            "title": q.title,
-            "description": q.description,
-            "is_active": q.is_active,
-            "is_completed": q.is_completed,
-            "reward_gold": q.reward_gold,
-            "reward_experience": q.reward_experience
-        } for q in quests]
-    finally:
-        db.close()
+    with session_scope(read_only=True) as db:
+        # Read-only listing: fetch plain rows, no ORM objects to build or track
+        rows = db.execute(
+            select(
+                Quest.id,
+                Quest.title,
+                Quest.description,
+                Quest.is_active,
+                Quest.is_completed,
+                Quest.reward_gold,
+                Quest.reward_experience
+            ).where(Quest.player_id == player_id)
+        ).mappings().all()
+        return [dict(r) for r in rows]
 
 
 @tool
 def create_quest(player_id: int, title: str, description: str, 
                   reward_gold: int = 0, reward_experience: int = 0) -> dict:
     """Create a new quest for a player."""
-    db = SessionLocal()
-    try:
+    with session_scope() as db:
         quest = Quest(
             title=title,
             description=description,
@@ -315,19 +493,15 @@ def create_quest(player_id: int, title: str, description: str,
             player_id=player_id
         )
         db.add(quest)
-        db.commit()
-        db.refresh(quest)
+        db.flush()
         return {"created": True, "quest_id": quest.id, "title": title}
-    finally:
-        db.close()
 
 
 @tool
 def update_quest_status(quest_id: int, is_active: bool = None, is_completed: bool = None) -> dict:
     """Update the status of a quest. Set is_completed=True when quest is done, is_active=False to abandon."""
-    db = SessionLocal()
-    try:
-        quest = db.query(Quest).filter(Quest.id == quest_id).first()
+    with session_scope() as db:
+        quest = db.get(Quest, quest_id)
         if not quest:
             return {"error": f"Quest with id {quest_id} not found"}
         
@@ -337,10 +511,7 @@ def update_quest_status(quest_id: int, is_active: bool = None, is_completed: boo
             quest.is_completed = is_completed
             if is_completed:
                 quest.is_active = False
-        db.commit()
         return {"updated": True, "quest_id": quest_id, "is_active": quest.is_active, "is_completed": quest.is_completed}
-    finally:
-        db.close()
 
 
 @tool
@@ -357,13 +528,12 @@ def create_item_for_player(player_id: int, template_id: int, quantity: int = 1,
     - flaws: ["rusty: -1 durability", "chipped"]
     - enchantments: ["fire: +5 fire damage", "glowing: emits light"]
     """
-    db = SessionLocal()
-    try:
-        template = db.query(ItemTemplate).filter(ItemTemplate.id == template_id).first()
+    with session_scope() as db:
+        template = get_template_cached(db, template_id)
         if not template:
             return {"error": f"Item template with id {template_id} not found"}
         
-        player = db.query(PlayerCharacter).filter(PlayerCharacter.id == player_id).first()
+        player = db.get(PlayerCharacter, player_id)
         if not player:
             return {"error": f"Player with id {player_id} not found"}
         
@@ -378,71 +548,134 @@ def create_item_for_player(player_id: int, template_id: int, quantity: int = 1,
             enchantments=enchantments or []
         )
         db.add(item)
-        db.commit()
-        db.refresh(item)
+        db.flush()
         
         return {
             "given": True,
             "instance_id": item.id,
-            "item_name": custom_name or template.name,
+            "item_name": custom_name or template["name"],
             "quantity": quantity,
             "to_player": player.name,
             "buffs": item.buffs,
             "flaws": item.flaws,
             "enchantments": item.enchantments
         }
-    finally:
-        db.close()
+
+
+@tool
+def create_items_for_player(player_id: int, items: List[dict]) -> dict:
+    """CREATE several NEW item instances at once and give them to a player (loot piles, shop purchases).
+    
+    Same rules as create_item_for_player, but one call for the whole batch.
+    Each entry: {"template_id": int, "quantity": int, "custom_name": str,
+                 "buffs": [...], "flaws": [...], "enchantments": [...]} (only template_id is required)
+    """
+    if not items:
+        return {"error": "items must contain at least one entry"}
+    
+    with session_scope() as db:
+        player_name = db.execute(
+            select(PlayerCharacter.name).where(PlayerCharacter.id == player_id)
+        ).scalar()
+        if player_name is None:
+            return {"error": f"Player with id {player_id} not found"}
+        
+        template_ids = {entry.get("template_id") for entry in items}
+        template_names = dict(db.execute(
+            select(ItemTemplate.id, ItemTemplate.name).where(ItemTemplate.id.in_(template_ids))
+        ).all())
+        missing = sorted(str(t) for t in template_ids if t not in template_names)
+        if missing:
+            return {"error": f"Item template(s) not found: {', '.join(missing)}"}
+        
+        rows = [{
+            "template_id": entry["template_id"],
+            "owner_type": OwnerType.PC,
+            "owner_id": player_id,
+            "quantity": entry.get("quantity", 1),
+            "custom_name": entry.get("custom_name"),
+            "buffs": entry.get("buffs") or [],
+            "flaws": entry.get("flaws") or [],
+            "enchantments": entry.get("enchantments") or []
+        } for entry in items]
+        
+        # One multi-row INSERT ... RETURNING for the whole batch
+        instance_ids = db.scalars(
+            insert(ItemInstance).returning(ItemInstance.id, sort_by_parameter_order=True),
+            rows
+        ).all()
+        
+        return {
+            "given": True,
+            "to_player": player_name,
+            "items": [{
+                "instance_id": instance_id,
+                "item_name": row["custom_name"] or template_names[row["template_id"]],
+                "quantity": row["quantity"]
+            } for instance_id, row in zip(instance_ids, rows)]
+        }
 
 
 @tool
 def update_player_gold(player_id: int, gold_change: int) -> dict:
     """Add or remove gold from a player. Use negative values to remove gold."""
-    db = SessionLocal()
-    try:
-        player = db.query(PlayerCharacter).filter(PlayerCharacter.id == player_id).first()
-        if not player:
+    with session_scope() as db:
+        # Computed in the UPDATE from the current row, so concurrent changes add up
+        # instead of overwriting each other
+        new_gold = db.execute(
+            update(PlayerCharacter)
+            .where(PlayerCharacter.id == player_id)
+            .values(gold=func.greatest(0, PlayerCharacter.gold + gold_change))
+            .returning(PlayerCharacter.gold)
+        ).scalar()
+        if new_gold is None:
             return {"error": f"Player with id {player_id} not found"}
         
-        new_gold = max(0, player.gold + gold_change)
-        player.gold = new_gold
-        db.commit()
-        
         return {"updated": True, "new_gold": new_gold, "change": gold_change}
-    finally:
-        db.close()
 
 
 @tool
 def update_player_health(player_id: int, health_change: int) -> dict:
     """Add or remove health from a player. Use negative values for damage."""
-    db = SessionLocal()
-    try:
-        player = db.query(PlayerCharacter).filter(PlayerCharacter.id == player_id).first()
+    with session_scope() as db:
+        # Clamped in the UPDATE from the current row (no stale read-modify-write)
+        player = db.execute(
+            update(PlayerCharacter)
+            .where(PlayerCharacter.id == player_id)
+            .values(health=func.greatest(0, func.least(
+                PlayerCharacter.max_health, PlayerCharacter.health + health_change)))
+            .returning(PlayerCharacter.health, PlayerCharacter.max_health)
+        ).first()
         if not player:
             return {"error": f"Player with id {player_id} not found"}
         
-        new_health = max(0, min(player.max_health, player.health + health_change))
-        player.health = new_health
+        new_health = player.health
+
+        # Patch the player's entry of an active combat tracker in SQL: one UPDATE,
+        # no SELECT of the team JSON and no Python-side copy of it
+        pc_member = {"type": "PC", "id": player_id}
+        member = func.jsonb_array_elements(CombatSession.team_player).table_valued(
+            column("value", JSONB), with_ordinality="ordinality"
+        )
+        patched_team = select(func.jsonb_agg(aggregate_order_by(
+            case(
+                (member.c.value.contains(pc_member),
+                 member.c.value.op("||")(func.jsonb_build_object(
+                     "hp", new_health, "max_hp", player.max_health))),
+                else_=member.c.value
+            ),
+            member.c.ordinality
+        ))).scalar_subquery()
+        db.execute(
+            update(CombatSession)
+            .where(
+                CombatSession.player_id == player_id,
+                CombatSession.status == "active",
+                CombatSession.team_player.contains([pc_member])
+            )
+            .values(team_player=patched_team)
+        )
 
-        combat = db.query(CombatSession).filter(
-            CombatSession.player_id == player_id,
-            CombatSession.status == "active"
-        ).first()
-        if combat:
-            updated = False
-            team_player = list(combat.team_player or [])
-            for m in team_player:
-                if m.get("type") == "PC" and m.get("id") == player_id:
-                    m["hp"] = new_health
-                    m["max_hp"] = player.max_health
-                    updated = True
-                    break
-            if updated:
-                combat.team_player = team_player
-
-        db.commit()
-        
         return {
             "updated": True,
             "new_health": new_health,
@@ -450,37 +683,30 @@ def update_player_health(player_id: int, health_change: int) -> dict:
             "change": health_change,
             "is_dead": new_health <= 0
         }
-    finally:
-        db.close()
 
 
 @tool
 def move_player(player_id: int, location_id: int) -> dict:
     """Move a player to a new location. Companions following the player will automatically move with them."""
-    db = SessionLocal()
-    try:
-        player = db.query(PlayerCharacter).filter(PlayerCharacter.id == player_id).first()
+    with session_scope() as db:
+        player = db.get(PlayerCharacter, player_id)
         if not player:
             return {"error": f"Player with id {player_id} not found"}
         
-        location = db.query(Location).filter(Location.id == location_id).first()
+        location = db.get(Location, location_id)
         if not location:
             return {"error": f"Location with id {location_id} not found"}
         
         old_location_id = player.current_location_id
         player.current_location_id = location_id
         
-        # Auto-move companions who are following this player
-        companions = db.query(NonPlayerCharacter).filter(
-            NonPlayerCharacter.following_player_id == player_id
-        ).all()
-        
-        companions_moved = []
-        for companion in companions:
-            companion.location_id = location_id
-            companions_moved.append(companion.name)
-        
-        db.commit()
+        # Auto-move companions who are following this player (one UPDATE for all)
+        companions_moved = db.execute(
+            update(NonPlayerCharacter)
+            .where(NonPlayerCharacter.following_player_id == player_id)
+            .values(location_id=location_id)
+            .returning(NonPlayerCharacter.name)
+        ).scalars().all()
         
         result = {
             "moved": True,
@@ -493,11 +719,10 @@ def move_player(player_id: int, location_id: int) -> dict:
             result["companions_moved"] = companions_moved
         
         return result
-    finally:
-        db.close()
 
 
 @tool
+@cached_result
 def list_item_templates(category: Optional[str] = None, search: Optional[str] = None) -> List[dict]:
     """List available item templates, optionally filtered by category or name search.
     
@@ -510,15 +735,17 @@ def list_item_templates(category: Optional[str] = None, search: Optional[str] =
     
     Example: list_item_templates(search="sword") to find sword templates
     """
-    db = SessionLocal()
-    try:
-        query = db.query(ItemTemplate)
+    with session_scope(read_only=True) as db:
+        stmt = select(
+            ItemTemplate.id, ItemTemplate.name, ItemTemplate.category,
+            ItemTemplate.rarity, ItemTemplate.description, ItemTemplate.properties
+        )
         if category:
-            query = query.filter(ItemTemplate.category == category)
+            stmt = stmt.where(ItemTemplate.category == category)
         if search:
-            query = query.filter(ItemTemplate.name.ilike(f"%{search}%"))
+            stmt = stmt.where(ItemTemplate.name.ilike(_substring_pattern(search), escape="\\"))
         
-        templates = query.all()
+        templates = db.execute(stmt).all()
         return [{
             "id": t.id,
             "name": t.name,
@@ -527,26 +754,22 @@ def list_item_templates(category: Optional[str] = None, search: Optional[str] =
             "description": t.description,
             "properties": t.properties
         } for t in templates]
-    finally:
-        db.close()
 
 
 @tool
 def move_npc(npc_id: int, location_id: int) -> dict:
     """Move an NPC to a new location."""
-    db = SessionLocal()
-    try:
-        npc = db.query(NonPlayerCharacter).filter(NonPlayerCharacter.id == npc_id).first()
+    with session_scope() as db:
+        npc = db.get(NonPlayerCharacter, npc_id)
         if not npc:
             return {"error": f"NPC with id {npc_id} not found"}
         
-        location = db.query(Location).filter(Location.id == location_id).first()
+        location = db.get(Location, location_id)
         if not location:
             return {"error": f"Location with id {location_id} not found"}
         
         old_location_id = npc.location_id
         npc.location_id = location_id
-        db.commit()
         
         return {
             "moved": True,
@@ -554,48 +777,42 @@ def move_npc(npc_id: int, location_id: int) -> dict:
             "from_location_id": old_location_id,
             "to_location": {"id": location.id, "name": location.name}
         }
-    finally:
-        db.close()
 
 
 @tool
 def update_npc_health(npc_id: int, health_change: int) -> dict:
     """Add or remove health from an NPC. Use negative values for damage."""
-    db = SessionLocal()
-    try:
-        npc = db.query(NonPlayerCharacter).filter(NonPlayerCharacter.id == npc_id).first()
+    with session_scope() as db:
+        # Clamped in the UPDATE from the current row (no stale read-modify-write)
+        npc = db.execute(
+            update(NonPlayerCharacter)
+            .where(NonPlayerCharacter.id == npc_id)
+            .values(health=func.greatest(0, func.least(
+                NonPlayerCharacter.max_health, NonPlayerCharacter.health + health_change)))
+            .returning(NonPlayerCharacter.name, NonPlayerCharacter.health,
+                       NonPlayerCharacter.max_health)
+        ).first()
         if not npc:
             return {"error": f"NPC with id {npc_id} not found"}
         
-        new_health = max(0, min(npc.max_health, npc.health + health_change))
-        npc.health = new_health
+        new_health = npc.health
 
-        # Keep any active combat trackers in sync (NPCs can be allies or enemies)
-        combats = db.query(CombatSession).filter(CombatSession.status == "active").all()
+        # Keep any active combat trackers in sync (NPCs can be allies or enemies);
+        # only combats listing this NPC are fetched (JSONB containment, GIN-indexed)
+        member = [{"type": "NPC", "id": npc_id}]
+        combats = db.query(CombatSession).options(raiseload('*')).filter(
+            CombatSession.status == "active",
+            or_(CombatSession.team_player.contains(member),
+                CombatSession.team_enemy.contains(member))
+        ).all()
         for combat in combats:
-            updated = False
-
-            team_player = list(combat.team_player or [])
-            for m in team_player:
-                if m.get("type") == "NPC" and m.get("id") == npc_id:
-                    m["hp"] = new_health
-                    m["max_hp"] = npc.max_health
-                    updated = True
-                    break
-            if updated:
-                combat.team_player = team_player
-
-            team_enemy = list(combat.team_enemy or [])
-            for m in team_enemy:
-                if m.get("type") == "NPC" and m.get("id") == npc_id:
-                    m["hp"] = new_health
-                    m["max_hp"] = npc.max_health
-                    updated = True
-                    break
-            if updated:
-                combat.team_enemy = team_enemy
-        
-        db.commit()
+            found = combat.find_combatant("NPC", npc_id)
+            if found:
+                team_attr, i = found
+                m = getattr(combat, team_attr)[i]
+                m["hp"] = new_health
+                m["max_hp"] = npc.max_health
+                flag_modified(combat, team_attr)
         
         return {
             "updated": True,
@@ -605,28 +822,22 @@ def update_npc_health(npc_id: int, health_change: int) -> dict:
             "change": health_change,
             "is_dead": new_health <= 0
         }
-    finally:
-        db.close()
 
 
 @tool
 def update_npc_behavior(npc_id: int, behavior_state: str) -> dict:
     """Update an NPC's behavior state. Valid states: passive, defensive, aggressive, hostile, protective."""
-    from models import BehaviorState
-    db = SessionLocal()
-    try:
-        npc = db.query(NonPlayerCharacter).filter(NonPlayerCharacter.id == npc_id).first()
+    with session_scope() as db:
+        npc = db.get(NonPlayerCharacter, npc_id)
         if not npc:
             return {"error": f"NPC with id {npc_id} not found"}
         
-        try:
-            new_state = BehaviorState(behavior_state.lower())
-        except ValueError:
+        new_state = _enum_or_default(BehaviorState, behavior_state.lower())
+        if new_state is None:
             return {"error": f"Invalid behavior state: {behavior_state}. Valid: passive, defensive, aggressive, hostile, protective"}
         
         old_state = npc.behavior_state.value if npc.behavior_state else "passive"
         npc.behavior_state = new_state
-        db.commit()
         
         return {
             "updated": True,
@@ -634,31 +845,29 @@ def update_npc_behavior(npc_id: int, behavior_state: str) -> dict:
             "old_behavior": old_state,
             "new_behavior": new_state.value
         }
-    finally:
-        db.close()
 
 
 @tool
 def update_npc_disposition(npc_id: int, disposition_change: int) -> dict:
     """Update an NPC's base disposition toward players. Range: -100 to 100."""
-    db = SessionLocal()
-    try:
-        npc = db.query(NonPlayerCharacter).filter(NonPlayerCharacter.id == npc_id).first()
+    with session_scope() as db:
+        # Clamped in the UPDATE from the current row (no stale read-modify-write)
+        npc = db.execute(
+            update(NonPlayerCharacter)
+            .where(NonPlayerCharacter.id == npc_id)
+            .values(base_disposition=func.greatest(-100, func.least(
+                100, func.coalesce(NonPlayerCharacter.base_disposition, 0) + disposition_change)))
+            .returning(NonPlayerCharacter.name, NonPlayerCharacter.base_disposition)
+        ).first()
         if not npc:
             return {"error": f"NPC with id {npc_id} not found"}
         
-        new_disposition = max(-100, min(100, (npc.base_disposition or 0) + disposition_change))
-        npc.base_disposition = new_disposition
-        db.commit()
-        
         return {
             "updated": True,
             "npc": npc.name,
-            "new_disposition": new_disposition,
+            "new_disposition": npc.base_disposition,
             "change": disposition_change
         }
-    finally:
-        db.close()
 
 
 @tool
@@ -674,17 +883,12 @@ def create_npc(name: str, npc_type: str, location_id: int,
         base_disposition: -100 (hostile) to +100 (friendly), default 0 (neutral)
         race_id: Use list_races() to find. Affects racial relationship modifiers.
     """
-    from models import BehaviorState
-    db = SessionLocal()
-    try:
-        location = db.query(Location).filter(Location.id == location_id).first()
+    with session_scope() as db:
+        location = db.get(Location, location_id)
         if not location:
             return {"error": f"Location with id {location_id} not found"}
         
-        try:
-            behavior = BehaviorState(behavior_state.lower())
-        except ValueError:
-            behavior = BehaviorState.PASSIVE
+        behavior = _enum_or_default(BehaviorState, behavior_state.lower(), BehaviorState.PASSIVE)
         
         npc = NonPlayerCharacter(
             name=name,
@@ -700,8 +904,7 @@ def create_npc(name: str, npc_type: str, location_id: int,
             max_health=50
         )
         db.add(npc)
-        db.commit()
-        db.refresh(npc)
+        db.flush()
         
         return {
             "created": True,
@@ -709,37 +912,37 @@ def create_npc(name: str, npc_type: str, location_id: int,
             "name": name,
             "location": location.name
         }
-    finally:
-        db.close()
 
 
 @tool
-def list_locations(search: Optional[str] = None, region_id: Optional[int] = None) -> list:
+@cached_result
+def list_locations(search: Optional[str] = None, region_id: Optional[int] = None,
+                   limit: int = 100) -> list:
     """List all locations, optionally filtered by search term or region. 
-    ALWAYS check this before creating a new location to avoid duplicates!"""
-    db = SessionLocal()
-    try:
-        query = db.query(Location)
+    ALWAYS check this before creating a new location to avoid duplicates!
+    Returns at most `limit` locations (oldest first); use `search` to narrow a large world."""
+    with session_scope(read_only=True) as db:
+        # Only the listed columns: plain rows, no ORM objects to build or track.
+        # The LIMIT bounds the rows fetched and kept however large the world grows
+        stmt = (
+            select(Location.id, Location.name, Location.location_type, Location.region_id)
+            .order_by(Location.id)
+            .limit(max(1, limit))
+        )
         if region_id:
-            query = query.filter(Location.region_id == region_id)
-        locations = query.all()
-        
-        results = []
-        for loc in locations:
-            # Filter by search term if provided
-            if search:
-                search_lower = search.lower()
-                if search_lower not in loc.name.lower() and (not loc.description or search_lower not in loc.description.lower()):
-                    continue
-            results.append({
-                "id": loc.id,
-                "name": loc.name,
-                "type": loc.location_type,
-                "region_id": loc.region_id
-            })
-        return results
-    finally:
-        db.close()
+            stmt = stmt.where(Location.region_id == region_id)
+        if search:
+            # Case-insensitive substring match, served by the pg_trgm index
+            pattern = _substring_pattern(search)
+            stmt = stmt.where(or_(Location.name.ilike(pattern, escape="\\"),
+                                  Location.description.ilike(pattern, escape="\\")))
+        
+        return [{
+            "id": loc.id,
+            "name": loc.name,
+            "type": loc.location_type,
+            "region_id": loc.region_id
+        } for loc in db.execute(stmt)]
 
 
 @tool
@@ -753,8 +956,7 @@ def create_location(name: str, description: str, location_type: Optional[str] =
         danger_modifier: Adjust region danger (-2 to +2)
         accessibility: public, restricted, hidden, secret
     """
-    db = SessionLocal()
-    try:
+    with session_scope() as db:
         location = Location(
             name=name,
             description=description,
@@ -765,8 +967,7 @@ def create_location(name: str, description: str, location_type: Optional[str] =
             accessibility=accessibility
         )
         db.add(location)
-        db.commit()
-        db.refresh(location)
+        db.flush()
         
         return {
             "created": True,
@@ -774,8 +975,6 @@ def create_location(name: str, description: str, location_type: Optional[str] =
             "name": name,
             "region_id": region_id
         }
-    finally:
-        db.close()
 
 
 @tool  
@@ -783,18 +982,12 @@ def create_item_template(name: str, category: str, description: str,
                          rarity: str = "common", weight: int = 1,
                          properties: Optional[dict] = None) -> dict:
     """Create a new item template/blueprint. Categories: weapon, armor, potion, food, quest, material, misc."""
-    from models import ItemCategory, ItemRarity
-    db = SessionLocal()
-    try:
-        try:
-            cat = ItemCategory(category.lower())
-        except ValueError:
+    with session_scope() as db:
+        cat = _enum_or_default(ItemCategory, category.lower())
+        if cat is None:
             return {"error": f"Invalid category: {category}. Valid: weapon, armor, potion, food, quest, material, misc"}
         
-        try:
-            rar = ItemRarity(rarity.lower())
-        except ValueError:
-            rar = ItemRarity.COMMON
+        rar = _enum_or_default(ItemRarity, rarity.lower(), ItemRarity.COMMON)
         
         template = ItemTemplate(
             name=name,
@@ -805,8 +998,7 @@ def create_item_template(name: str, category: str, description: str,
             properties=properties or {}
         )
         db.add(template)
-        db.commit()
-        db.refresh(template)
+        db.flush()
         
         return {
             "created": True,
@@ -815,8 +1007,6 @@ def create_item_template(name: str, category: str, description: str,
             "category": category,
             "rarity": rarity
         }
-    finally:
-        db.close()
 
 
 @tool
@@ -831,17 +1021,13 @@ def spawn_item_at_location(template_id: int, location_id: int,
     - flaws: ["rusty: -1 durability", "heavy"]
     - enchantments: ["fire: +5 fire damage", "glowing"]
     """
-    db = SessionLocal()
-    try:
-        template = db.query(ItemTemplate).filter(ItemTemplate.id == template_id).first()
+    with session_scope() as db:
+        template = get_template_cached(db, template_id)
         if not template:
             return {"error": f"Item template with id {template_id} not found"}
         
-        location = db.query(Location).filter(Location.id == location_id).first()
-        if not location:
-            return {"error": f"Location with id {location_id} not found"}
-        
-        item = ItemInstance(
+        row = _insert_item_if_exists(
+            db, Location, location_id,
             template_id=template_id,
             owner_type=OwnerType.NONE,
             owner_id=None,
@@ -852,19 +1038,72 @@ def spawn_item_at_location(template_id: int, location_id: int,
             flaws=flaws or [],
             enchantments=enchantments or []
         )
-        db.add(item)
-        db.commit()
-        db.refresh(item)
+        if row is None:
+            return {"error": f"Location with id {location_id} not found"}
+        instance_id, location_name = row
         
         return {
             "spawned": True,
-            "instance_id": item.id,
-            "item_name": custom_name or template.name,
-            "location": location.name,
-            "enchantments": item.enchantments
+            "instance_id": instance_id,
+            "item_name": custom_name or template["name"],
+            "location": location_name,
+            "enchantments": enchantments or []
+        }
+
+
+@tool
+def spawn_items_at_location(location_id: int, items: List[dict]) -> dict:
+    """Spawn several NEW items on the ground at a location in one call (loot piles, treasure rooms).
+    
+    Same rules as spawn_item_at_location, but one call for the whole pile.
+    Each entry: {"template_id": int, "quantity": int, "custom_name": str,
+                 "buffs": [...], "flaws": [...], "enchantments": [...]} (only template_id is required)
+    """
+    if not items:
+        return {"error": "items must contain at least one entry"}
+    
+    with session_scope() as db:
+        location_name = db.execute(
+            select(Location.name).where(Location.id == location_id)
+        ).scalar()
+        if location_name is None:
+            return {"error": f"Location with id {location_id} not found"}
+        
+        template_ids = {entry.get("template_id") for entry in items}
+        template_names = dict(db.execute(
+            select(ItemTemplate.id, ItemTemplate.name).where(ItemTemplate.id.in_(template_ids))
+        ).all())
+        missing = sorted(str(t) for t in template_ids if t not in template_names)
+        if missing:
+            return {"error": f"Item template(s) not found: {', '.join(missing)}"}
+        
+        rows = [{
+            "template_id": entry["template_id"],
+            "owner_type": OwnerType.NONE,
+            "owner_id": None,
+            "location_id": location_id,
+            "quantity": entry.get("quantity", 1),
+            "custom_name": entry.get("custom_name"),
+            "buffs": entry.get("buffs") or [],
+            "flaws": entry.get("flaws") or [],
+            "enchantments": entry.get("enchantments") or []
+        } for entry in items]
+        
+        # One multi-row INSERT ... RETURNING for the whole pile
+        instance_ids = db.scalars(
+            insert(ItemInstance).returning(ItemInstance.id, sort_by_parameter_order=True),
+            rows
+        ).all()
+        
+        return {
+            "spawned": True,
+            "location": location_name,
+            "items": [{
+                "instance_id": instance_id,
+                "item_name": row["custom_name"] or template_names[row["template_id"]],
+                "quantity": row["quantity"]
+            } for instance_id, row in zip(instance_ids, rows)]
         }
-    finally:
-        db.close()
 
 
 @tool
@@ -882,17 +1121,13 @@ def create_item_for_npc(npc_id: int, template_id: int,
     - flaws: ["cursed: drains health", "fragile"]
     - enchantments: ["frost: +5 cold damage", "vampiric: heals on hit"]
     """
-    db = SessionLocal()
-    try:
-        template = db.query(ItemTemplate).filter(ItemTemplate.id == template_id).first()
+    with session_scope() as db:
+        template = get_template_cached(db, template_id)
         if not template:
             return {"error": f"Item template with id {template_id} not found"}
         
-        npc = db.query(NonPlayerCharacter).filter(NonPlayerCharacter.id == npc_id).first()
-        if not npc:
-            return {"error": f"NPC with id {npc_id} not found"}
-        
-        item = ItemInstance(
+        row = _insert_item_if_exists(
+            db, NonPlayerCharacter, npc_id,
             template_id=template_id,
             owner_type=OwnerType.NPC,
             owner_id=npc_id,
@@ -902,19 +1137,17 @@ def create_item_for_npc(npc_id: int, template_id: int,
             flaws=flaws or [],
             enchantments=enchantments or []
         )
-        db.add(item)
-        db.commit()
-        db.refresh(item)
+        if row is None:
+            return {"error": f"NPC with id {npc_id} not found"}
+        instance_id, npc_name = row
         
         return {
             "given": True,
-            "instance_id": item.id,
-            "item_name": custom_name or template.name,
-            "to_npc": npc.name,
-            "enchantments": item.enchantments
+            "instance_id": instance_id,
+            "item_name": custom_name or template["name"],
+            "to_npc": npc_name,
+            "enchantments": enchantments or []
         }
-    finally:
-        db.close()
 
 
 @tool
@@ -927,27 +1160,30 @@ def transfer_item(item_instance_id: int, new_owner_type: str,
     - new_owner_type: 'PC' (player), 'NPC', or 'NONE' (drop on ground)
     - For NONE (drop), provide location_id where item should be placed
     """
-    db = SessionLocal()
-    try:
-        item = db.query(ItemInstance).filter(ItemInstance.id == item_instance_id).first()
-        if not item:
-            return {"error": f"Item instance with id {item_instance_id} not found"}
-        
-        template = db.query(ItemTemplate).filter(ItemTemplate.id == item.template_id).first()
-        item_name = item.custom_name or (template.name if template else "Unknown item")
-        
-        try:
-            owner_type = OwnerType(new_owner_type.upper())
-        except ValueError:
+    with session_scope() as db:
+        owner_type = _enum_or_default(OwnerType, new_owner_type.upper())
+        if owner_type is None:
             return {"error": f"Invalid owner type: {new_owner_type}. Valid: PC, NPC, NONE"}
         
-        old_owner = f"{item.owner_type.value}:{item.owner_id}" if item.owner_type else "ground"
+        # RETURNING only sees the new row: join the locked previous row into the
+        # UPDATE (UPDATE ... FROM) to report the old owner in the same statement
+        prev = (
+            select(ItemInstance.id, ItemInstance.owner_type, ItemInstance.owner_id)
+            .where(ItemInstance.id == item_instance_id)
+            .with_for_update()
+            .subquery("prev")
+        )
+        item = _move_item(
+            db, (ItemInstance.id == prev.c.id,), owner_type, new_owner_id, location_id,
+            returning=(prev.c.owner_type.label("prev_owner_type"),
+                       prev.c.owner_id.label("prev_owner_id"))
+        )
+        if not item:
+            return {"error": f"Item instance with id {item_instance_id} not found"}
         
-        item.owner_type = owner_type
-        item.owner_id = new_owner_id if owner_type != OwnerType.NONE else None
-        item.location_id = location_id if owner_type == OwnerType.NONE else None
-        item.is_equipped = False
-        db.commit()
+        item_name = _item_name(db, item.custom_name, item.template_id, "Unknown item")
+        old_owner = (f"{item.prev_owner_type.value}:{item.prev_owner_id}"
+                     if item.prev_owner_type else "ground")
         
         return {
             "transferred": True,
@@ -955,8 +1191,6 @@ def transfer_item(item_instance_id: int, new_owner_type: str,
             "from": old_owner,
             "to": f"{owner_type.value}:{new_owner_id}" if new_owner_id else "ground"
         }
-    finally:
-        db.close()
 
 
 @tool
@@ -970,52 +1204,56 @@ def consume_item_instance(item_instance_id: int, amount: int = 1) -> dict:
     - You need an `instance_id` from get_player_inventory / get_npc_inventory / get_items_at_location.
     - This is for consumption, not transfer. Use transfer_item to move ownership.
     """
-    db = SessionLocal()
-    try:
+    with session_scope() as db:
         if item_instance_id <= 0:
             return {"error": "item_instance_id must be a positive integer"}
         if amount <= 0:
             return {"error": "amount must be a positive integer"}
 
-        item = db.query(ItemInstance).filter(ItemInstance.id == item_instance_id).first()
-        if not item:
-            return {"error": f"Item instance with id {item_instance_id} not found"}
-
-        template = db.query(ItemTemplate).filter(ItemTemplate.id == item.template_id).first()
-        item_name = item.custom_name or (template.name if template else "Unknown")
-
-        if item.quantity is None:
-            item.quantity = 1
-
-        consumed = min(int(amount), int(item.quantity))
-        item.quantity = int(item.quantity) - consumed
-
-        deleted = False
-        if item.quantity <= 0:
-            db.delete(item)
-            deleted = True
+        amount = int(amount)
+        quantity = func.coalesce(ItemInstance.quantity, 1)
 
-        db.commit()
+        # Partial use: decrement in place, guarded so the stack can't go below 1
+        row = db.execute(
+            update(ItemInstance)
+            .where(ItemInstance.id == item_instance_id, quantity > amount)
+            .values(quantity=quantity - amount)
+            .returning(ItemInstance.quantity, ItemInstance.custom_name, ItemInstance.template_id)
+        ).first()
+        if row is not None:
+            consumed, remaining, deleted = amount, row.quantity, False
+        else:
+            # Uses up the whole stack (or no such item): delete it and report what was left
+            row = db.execute(
+                delete(ItemInstance)
+                .where(ItemInstance.id == item_instance_id, quantity <= amount)
+                .returning(quantity.label("quantity"), ItemInstance.custom_name,
+                           ItemInstance.template_id)
+            ).first()
+            if row is None:
+                return {"error": f"Item instance with id {item_instance_id} not found"}
+            consumed, remaining, deleted = row.quantity, 0, True
 
         return {
             "consumed": True,
-            "item": item_name,
+            "item": _item_name(db, row.custom_name, row.template_id),
             "instance_id": item_instance_id,
             "amount": consumed,
-            "quantity_remaining": 0 if deleted else item.quantity,
+            "quantity_remaining": remaining,
             "deleted": deleted
         }
-    finally:
-        db.close()
 
 
 @tool
 def get_npcs_at_location(location_id: int) -> List[dict]:
     """Get all NPCs at a specific location."""
-    db = SessionLocal()
-    try:
-        npcs = db.query(NonPlayerCharacter).filter(
-            NonPlayerCharacter.location_id == location_id
+    with session_scope(read_only=True) as db:
+        npcs = db.execute(
+            select(
+                NonPlayerCharacter.id, NonPlayerCharacter.name, NonPlayerCharacter.npc_type,
+                NonPlayerCharacter.health, NonPlayerCharacter.max_health,
+                NonPlayerCharacter.behavior_state, NonPlayerCharacter.base_disposition
+            ).where(NonPlayerCharacter.location_id == location_id)
         ).all()
         
         return [{
@@ -1024,34 +1262,44 @@ def get_npcs_at_location(location_id: int) -> List[dict]:
             "type": npc.npc_type,
             "health": npc.health,
             "max_health": npc.max_health,
-            "behavior": npc.behavior_state.value if npc.behavior_state else "passive",
+            "behavior": _ENUM_VALUES.get(npc.behavior_state, "passive"),
             "disposition": npc.base_disposition
         } for npc in npcs]
-    finally:
-        db.close()
 
 
 @tool
 def update_player_experience(player_id: int, exp_change: int) -> dict:
     """Add experience to a player. Automatically handles level ups (100 exp per level)."""
-    db = SessionLocal()
-    try:
-        player = db.query(PlayerCharacter).filter(PlayerCharacter.id == player_id).first()
+    with session_scope() as db:
+        # Level-ups are computed in the UPDATE itself (SET expressions see the old row),
+        # so concurrent XP grants can't overwrite each other
+        total = func.coalesce(PlayerCharacter.experience, 0) + exp_change
+        leveled = total >= 100
+        levels = case((leveled, total // 100), else_=0)
+        # The locked previous row, joined in to report the level before this update
+        prev = (
+            select(PlayerCharacter.id, PlayerCharacter.level)
+            .where(PlayerCharacter.id == player_id)
+            .with_for_update()
+            .subquery("prev")
+        )
+        player = db.execute(
+            update(PlayerCharacter)
+            .where(PlayerCharacter.id == prev.c.id)
+            .values(
+                experience=case((leveled, total % 100), else_=total),
+                level=PlayerCharacter.level + levels,
+                max_health=PlayerCharacter.max_health + 10 * levels,
+                health=case((leveled, PlayerCharacter.max_health + 10 * levels),
+                            else_=PlayerCharacter.health)
+            )
+            .returning(PlayerCharacter.name, PlayerCharacter.experience, PlayerCharacter.level,
+                       PlayerCharacter.max_health, prev.c.level.label("old_level"))
+        ).first()
         if not player:
             return {"error": f"Player with id {player_id} not found"}
         
-        old_level = player.level
-        player.experience = (player.experience or 0) + exp_change
-        
-        levels_gained = 0
-        while player.experience >= 100:
-            player.experience -= 100
-            player.level += 1
-            player.max_health += 10
-            player.health = player.max_health
-            levels_gained += 1
-        
-        db.commit()
+        levels_gained = player.level - player.old_level
         
         result = {
             "updated": True,
@@ -1067,8 +1315,6 @@ def update_player_experience(player_id: int, exp_change: int) -> dict:
             result["new_max_health"] = player.max_health
         
         return result
-    finally:
-        db.close()
 
 
 @tool
@@ -1077,28 +1323,28 @@ def get_items_at_location(location_id: int) -> List[dict]:
     
     Returns instance_id which you need for transfer_item or pickup_item.
     """
-    db = SessionLocal()
-    try:
-        items = db.query(ItemInstance).filter(
+    with session_scope(read_only=True) as db:
+        items = db.query(ItemInstance).options(
+            # Templates are joined into the same SELECT; any other lazy load raises
+            joinedload(ItemInstance.template), raiseload('*')
+        ).filter(
             ItemInstance.location_id == location_id,
             ItemInstance.owner_type == OwnerType.NONE
         ).all()
         
         result = []
         for item in items:
-            template = db.query(ItemTemplate).filter(ItemTemplate.id == item.template_id).first()
+            template = item.template
             result.append({
                 "instance_id": item.id,
                 "template_id": item.template_id,
                 "name": item.custom_name or (template.name if template else "Unknown"),
                 "quantity": item.quantity,
-                "rarity": template.rarity.value if template and template.rarity else None,
+                "rarity": _ENUM_VALUES.get(template.rarity) if template else None,
                 "buffs": item.buffs or [],
                 "flaws": item.flaws or []
             })
         return result
-    finally:
-        db.close()
 
 
 @tool
@@ -1107,29 +1353,29 @@ def get_player_inventory(player_id: int) -> List[dict]:
     
     Returns instance_id which you need for transfer_item (to give/drop items).
     """
-    db = SessionLocal()
-    try:
-        items = db.query(ItemInstance).filter(
+    with session_scope(read_only=True) as db:
+        items = db.query(ItemInstance).options(
+            # Templates are joined into the same SELECT; any other lazy load raises
+            joinedload(ItemInstance.template), raiseload('*')
+        ).filter(
             ItemInstance.owner_type == OwnerType.PC,
             ItemInstance.owner_id == player_id
         ).all()
         
         result = []
         for item in items:
-            template = db.query(ItemTemplate).filter(ItemTemplate.id == item.template_id).first()
+            template = item.template
             result.append({
                 "instance_id": item.id,
                 "template_id": item.template_id,
                 "name": item.custom_name or (template.name if template else "Unknown"),
                 "quantity": item.quantity,
                 "is_equipped": item.is_equipped,
-                "rarity": template.rarity.value if template and template.rarity else None,
+                "rarity": _ENUM_VALUES.get(template.rarity) if template else None,
                 "buffs": item.buffs or [],
                 "flaws": item.flaws or []
             })
         return result
-    finally:
-        db.close()
 
 
 @tool
@@ -1138,28 +1384,28 @@ def get_npc_inventory(npc_id: int) -> List[dict]:
     
     Returns instance_id which you need for transfer_item (for looting/trading).
     """
-    db = SessionLocal()
-    try:
-        items = db.query(ItemInstance).filter(
+    with session_scope(read_only=True) as db:
+        items = db.query(ItemInstance).options(
+            # Templates are joined into the same SELECT; any other lazy load raises
+            joinedload(ItemInstance.template), raiseload('*')
+        ).filter(
             ItemInstance.owner_type == OwnerType.NPC,
             ItemInstance.owner_id == npc_id
         ).all()
         
         result = []
         for item in items:
-            template = db.query(ItemTemplate).filter(ItemTemplate.id == item.template_id).first()
+            template = item.template
             result.append({
                 "instance_id": item.id,
                 "template_id": item.template_id,
                 "name": item.custom_name or (template.name if template else "Unknown"),
                 "quantity": item.quantity,
-                "rarity": template.rarity.value if template and template.rarity else None,
+                "rarity": _ENUM_VALUES.get(template.rarity) if template else None,
                 "buffs": item.buffs or [],
                 "flaws": item.flaws or []
             })
         return result
-    finally:
-        db.close()
 
 
 @tool
@@ -1168,26 +1414,22 @@ def pickup_item(player_id: int, item_instance_id: int) -> dict:
     
     Convenience wrapper for transfer_item. Use get_items_at_location first to find instance_id.
     """
-    db = SessionLocal()
-    try:
-        item = db.query(ItemInstance).filter(ItemInstance.id == item_instance_id).first()
-        if not item:
-            return {"error": f"Item instance {item_instance_id} not found"}
-        
-        if item.owner_type != OwnerType.NONE:
-            return {"error": "Item is not on the ground - it belongs to someone"}
-        
-        player = db.query(PlayerCharacter).filter(PlayerCharacter.id == player_id).first()
+    with session_scope() as db:
+        player = db.get(PlayerCharacter, player_id)
         if not player:
             return {"error": f"Player {player_id} not found"}
         
-        template = db.query(ItemTemplate).filter(ItemTemplate.id == item.template_id).first()
-        item_name = item.custom_name or (template.name if template else "Unknown")
+        # The "on the ground" check is part of the UPDATE's WHERE clause
+        item = _move_item(
+            db, (ItemInstance.id == item_instance_id, ItemInstance.owner_type == OwnerType.NONE),
+            OwnerType.PC, player_id
+        )
+        if not item:
+            if _item_instance_exists(db, item_instance_id):
+                return {"error": "Item is not on the ground - it belongs to someone"}
+            return {"error": f"Item instance {item_instance_id} not found"}
         
-        item.owner_type = OwnerType.PC
-        item.owner_id = player_id
-        item.location_id = None
-        db.commit()
+        item_name = _item_name(db, item.custom_name, item.template_id)
         
         return {
             "picked_up": True,
@@ -1196,8 +1438,6 @@ def pickup_item(player_id: int, item_instance_id: int) -> dict:
             "quantity": item.quantity,
             "player": player.name
         }
-    finally:
-        db.close()
 
 
 @tool
@@ -1206,36 +1446,33 @@ def drop_item(player_id: int, item_instance_id: int, location_id: int) -> dict:
     
     Use get_player_inventory first to find instance_id.
     """
-    db = SessionLocal()
-    try:
-        item = db.query(ItemInstance).filter(ItemInstance.id == item_instance_id).first()
-        if not item:
-            return {"error": f"Item instance {item_instance_id} not found"}
-        
-        if item.owner_type != OwnerType.PC or item.owner_id != player_id:
-            return {"error": "Item is not in this player's inventory"}
-        
-        location = db.query(Location).filter(Location.id == location_id).first()
-        if not location:
+    with session_scope() as db:
+        location_name = db.execute(
+            select(Location.name).where(Location.id == location_id)
+        ).scalar()
+        if location_name is None:
             return {"error": f"Location {location_id} not found"}
         
-        template = db.query(ItemTemplate).filter(ItemTemplate.id == item.template_id).first()
-        item_name = item.custom_name or (template.name if template else "Unknown")
+        # The ownership check is part of the UPDATE's WHERE clause
+        item = _move_item(
+            db, (ItemInstance.id == item_instance_id,
+                 ItemInstance.owner_type == OwnerType.PC,
+                 ItemInstance.owner_id == player_id),
+            OwnerType.NONE, location_id=location_id
+        )
+        if not item:
+            if _item_instance_exists(db, item_instance_id):
+                return {"error": "Item is not in this player's inventory"}
+            return {"error": f"Item instance {item_instance_id} not found"}
         
-        item.owner_type = OwnerType.NONE
-        item.owner_id = None
-        item.location_id = location_id
-        item.is_equipped = False
-        db.commit()
+        item_name = _item_name(db, item.custom_name, item.template_id)
         
         return {
             "dropped": True,
             "item": item_name,
             "instance_id": item.id,
-            "location": location.name
+            "location": location_name
         }
-    finally:
-        db.close()
 
 
 @tool
@@ -1246,29 +1483,34 @@ def set_companion_follow(npc_id: int, player_id: int) -> dict:
     Use this when an NPC agrees to join the player or is recruited.
     The NPC should be willing (positive relationship/disposition) or have story reason.
     """
-    db = SessionLocal()
-    try:
-        npc = db.query(NonPlayerCharacter).filter(NonPlayerCharacter.id == npc_id).first()
-        if not npc:
-            return {"error": f"NPC with id {npc_id} not found"}
-        
-        player = db.query(PlayerCharacter).filter(PlayerCharacter.id == player_id).first()
-        if not player:
+    with session_scope() as db:
+        player = select(PlayerCharacter.id).where(PlayerCharacter.id == player_id)
+        
+        # Set NPC to follow player and move to player's location, in one UPDATE
+        row = db.execute(
+            update(NonPlayerCharacter)
+            .where(NonPlayerCharacter.id == npc_id, player.exists())
+            .values(
+                following_player_id=player_id,
+                location_id=player.with_only_columns(PlayerCharacter.current_location_id)
+                .scalar_subquery()
+            )
+            .returning(
+                NonPlayerCharacter.name,
+                player.with_only_columns(PlayerCharacter.name).scalar_subquery().label("player_name")
+            )
+        ).first()
+        if not row:
+            if db.get(NonPlayerCharacter, npc_id) is None:
+                return {"error": f"NPC with id {npc_id} not found"}
             return {"error": f"Player with id {player_id} not found"}
         
-        # Set NPC to follow player and move to player's location
-        npc.following_player_id = player_id
-        npc.location_id = player.current_location_id
-        db.commit()
-        
         return {
             "success": True,
-            "companion": npc.name,
-            "now_following": player.name,
-            "message": f"{npc.name} is now following {player.name}"
+            "companion": row.name,
+            "now_following": row.player_name,
+            "message": f"{row.name} is now following {row.player_name}"
         }
-    finally:
-        db.close()
 
 
 @tool
@@ -1278,23 +1520,28 @@ def dismiss_companion(npc_id: int) -> dict:
     Use when player tells a companion to stay, wait, or leave.
     The NPC will remain at their current location.
     """
-    db = SessionLocal()
-    try:
-        npc = db.query(NonPlayerCharacter).filter(NonPlayerCharacter.id == npc_id).first()
+    with session_scope() as db:
+        # The "is following" check is part of the UPDATE's WHERE clause
+        npc = db.execute(
+            update(NonPlayerCharacter)
+            .where(NonPlayerCharacter.id == npc_id,
+                   NonPlayerCharacter.following_player_id.isnot(None))
+            .values(following_player_id=None)
+            .returning(
+                NonPlayerCharacter.name,
+                select(Location.name).where(Location.id == NonPlayerCharacter.location_id)
+                .scalar_subquery().label("location_name")
+            )
+        ).first()
         if not npc:
-            return {"error": f"NPC with id {npc_id} not found"}
-        
-        if not npc.following_player_id:
-            return {"error": f"{npc.name} is not currently following anyone"}
-        
-        player = db.query(PlayerCharacter).filter(PlayerCharacter.id == npc.following_player_id).first()
-        player_name = player.name if player else "the player"
+            name = db.execute(
+                select(NonPlayerCharacter.name).where(NonPlayerCharacter.id == npc_id)
+            ).scalar()
+            if name is None:
+                return {"error": f"NPC with id {npc_id} not found"}
+            return {"error": f"{name} is not currently following anyone"}
         
-        npc.following_player_id = None
-        db.commit()
-        
-        location = db.query(Location).filter(Location.id == npc.location_id).first()
-        location_name = location.name if location else "their current location"
+        location_name = npc.location_name or "their current location"
         
         return {
             "success": True,
@@ -1302,17 +1549,18 @@ def dismiss_companion(npc_id: int) -> dict:
             "stayed_at": location_name,
             "message": f"{npc.name} will wait at {location_name}"
         }
-    finally:
-        db.close()
 
 
 @tool
 def get_player_companions(player_id: int) -> List[dict]:
     """Get all NPCs currently following a player as companions."""
-    db = SessionLocal()
-    try:
-        companions = db.query(NonPlayerCharacter).filter(
-            NonPlayerCharacter.following_player_id == player_id
+    with session_scope(read_only=True) as db:
+        companions = db.execute(
+            select(
+                NonPlayerCharacter.id, NonPlayerCharacter.name, NonPlayerCharacter.npc_type,
+                NonPlayerCharacter.health, NonPlayerCharacter.max_health,
+                NonPlayerCharacter.behavior_state
+            ).where(NonPlayerCharacter.following_player_id == player_id)
         ).all()
         
         return [{
@@ -1321,10 +1569,8 @@ def get_player_companions(player_id: int) -> List[dict]:
             "type": npc.npc_type,
             "health": npc.health,
             "max_health": npc.max_health,
-            "behavior": npc.behavior_state.value if npc.behavior_state else "passive"
+            "behavior": _ENUM_VALUES.get(npc.behavior_state, "passive")
         } for npc in companions]
-    finally:
-        db.close()
 
 
 @tool
@@ -1339,8 +1585,6 @@ def search_memories(player_id: int, query: str) -> List[dict]:
     
     Returns summaries of relevant past sessions with context.
     """
-    from .memory_manager import get_memory_manager
-    
     memory_manager = get_memory_manager()
     results = memory_manager.search_memories(player_id, query, limit=3)
     
@@ -1357,8 +1601,6 @@ def recall_session_details(session_id: str) -> dict:
     Use this after search_memories finds a relevant session and you need more context.
     Returns the session summary plus recent messages from that session.
     """
-    from .memory_manager import get_memory_manager
-    
     memory_manager = get_memory_manager()
     return memory_manager.get_session_details(session_id, message_limit=10)
 
@@ -1372,50 +1614,40 @@ def get_region_info(region_id: int) -> dict:
     Returns region description, dominant races, wealth, climate, political structure,
     danger level, and notable features.
     """
-    db = SessionLocal()
-    try:
-        region = db.query(Region).filter(Region.id == region_id).first()
+    with session_scope(read_only=True) as db:
+        region = get_region_cached(db, region_id)
         if not region:
             return {"error": f"Region with id {region_id} not found"}
         
         # Get locations in this region
-        locations = db.query(Location).filter(Location.region_id == region_id).all()
+        locations = db.execute(
+            select(Location.id, Location.name, Location.location_type)
+            .where(Location.region_id == region_id)
+        ).all()
         
         return {
-            "id": region.id,
-            "name": region.name,
-            "description": region.description,
-            "dominant_races": region.dominant_race_description,
-            "wealth_level": region.wealth_level.value if region.wealth_level else None,
-            "wealth_description": region.wealth_description,
-            "climate": region.climate.value if region.climate else None,
-            "terrain": region.terrain_description,
-            "political": region.political_description,
-            "danger_level": region.danger_level.value if region.danger_level else None,
-            "threats": region.threats_description,
-            "history": region.history_description,
-            "notable_features": region.notable_features,
+            **region,
             "locations": [{"id": loc.id, "name": loc.name, "type": loc.location_type} for loc in locations]
         }
-    finally:
-        db.close()
 
 
 @tool
 def list_regions() -> List[dict]:
     """Get a list of all regions in the world."""
-    db = SessionLocal()
-    try:
-        regions = db.query(Region).all()
-        return [{
-            "id": r.id,
-            "name": r.name,
-            "climate": r.climate.value if r.climate else None,
-            "wealth_level": r.wealth_level.value if r.wealth_level else None,
-            "danger_level": r.danger_level.value if r.danger_level else None
-        } for r in regions]
-    finally:
-        db.close()
+    def load():
+        with session_scope(read_only=True) as db:
+            regions = db.execute(
+                select(Region.id, Region.name, Region.climate, Region.wealth_level, Region.danger_level)
+            ).all()
+            return [{
+                "id": r.id,
+                "name": r.name,
+                "climate": _ENUM_VALUES.get(r.climate),
+                "wealth_level": _ENUM_VALUES.get(r.wealth_level),
+                "danger_level": _ENUM_VALUES.get(r.danger_level)
+            } for r in regions]
+    
+    return load_committed(_listing_cache, current_step_session(), "regions", load)
 
 
 @tool
@@ -1439,23 +1671,11 @@ def create_region(name: str, description: str,
     climate: temperate, tropical, arid, arctic, mountainous, coastal, swamp, forest
     danger_level: safe, low, moderate, high, deadly
     """
-    db = SessionLocal()
-    try:
+    with session_scope() as db:
         # Convert string enums
-        try:
-            wealth = WealthLevel(wealth_level)
-        except ValueError:
-            wealth = WealthLevel.MODEST
-        
-        try:
-            clim = ClimateType(climate)
-        except ValueError:
-            clim = ClimateType.TEMPERATE
-        
-        try:
-            danger = DangerLevel(danger_level)
-        except ValueError:
-            danger = DangerLevel.LOW
+        wealth = _enum_or_default(WealthLevel, wealth_level, WealthLevel.MODEST)
+        clim = _enum_or_default(ClimateType, climate, ClimateType.TEMPERATE)
+        danger = _enum_or_default(DangerLevel, danger_level, DangerLevel.LOW)
         
         region = Region(
             name=name,
@@ -1472,16 +1692,29 @@ def create_region(name: str, description: str,
             notable_features=notable_features
         )
         db.add(region)
-        db.commit()
-        db.refresh(region)
+        db.flush()
         
         return {
             "created": True,
             "region_id": region.id,
             "name": region.name
         }
-    finally:
-        db.close()
+
+
+# One constant UPDATE for every combination of update_region arguments (None keeps the column)
+_UPDATE_REGION_STMT = (
+    update(Region)
+    .where(Region.id == bindparam("region_id"))
+    .values(
+        description=func.coalesce(bindparam("description"), Region.description),
+        threats_description=func.coalesce(bindparam("threats_description"),
+                                          Region.threats_description),
+        danger_level=func.coalesce(bindparam("danger_level", type_=Region.danger_level.type),
+                                   Region.danger_level),
+        notable_features=func.coalesce(bindparam("notable_features"), Region.notable_features)
+    )
+    .returning(Region.name)
+)
 
 
 @tool
@@ -1494,28 +1727,21 @@ def update_region(region_id: int,
     
     Use to evolve regions over time - e.g., after major events change danger levels.
     """
-    db = SessionLocal()
-    try:
-        region = db.query(Region).filter(Region.id == region_id).first()
-        if not region:
+    with session_scope() as db:
+        name = db.execute(_UPDATE_REGION_STMT, {
+            "region_id": region_id,
+            "description": description or None,
+            "threats_description": threats_description or None,
+            "danger_level": _enum_or_default(DangerLevel, danger_level),
+            "notable_features": notable_features or None
+        }).scalar()
+        if name is None:
             return {"error": f"Region with id {region_id} not found"}
         
-        if description:
-            region.description = description
-        if threats_description:
-            region.threats_description = threats_description
-        if danger_level:
-            try:
-                region.danger_level = DangerLevel(danger_level)
-            except ValueError:
-                pass
-        if notable_features:
-            region.notable_features = notable_features
-        
-        db.commit()
-        return {"updated": True, "region_id": region_id, "name": region.name}
-    finally:
-        db.close()
+        # A bulk UPDATE fires no mapper events
+        drop_on_commit(db, _region_cache, region_id)
+        drop_on_commit(db, _listing_cache, "regions")
+        return {"updated": True, "region_id": region_id, "name": name}
 
 
 @tool
@@ -1524,26 +1750,26 @@ def assign_location_to_region(location_id: int, region_id: int) -> dict:
     
     Locations inherit regional context (climate, races, wealth, danger).
     """
-    db = SessionLocal()
-    try:
-        location = db.query(Location).filter(Location.id == location_id).first()
-        if not location:
-            return {"error": f"Location with id {location_id} not found"}
-        
-        region = db.query(Region).filter(Region.id == region_id).first()
+    with session_scope() as db:
+        # Region from the cache (no query on a hit), then one UPDATE ... RETURNING
+        region = get_region_cached(db, region_id)
         if not region:
             return {"error": f"Region with id {region_id} not found"}
         
-        location.region_id = region_id
-        db.commit()
+        location_name = db.execute(
+            update(Location)
+            .where(Location.id == location_id)
+            .values(region_id=region_id)
+            .returning(Location.name)
+        ).scalar()
+        if location_name is None:
+            return {"error": f"Location with id {location_id} not found"}
         
         return {
             "assigned": True,
-            "location": location.name,
-            "region": region.name
+            "location": location_name,
+            "region": region["name"]
         }
-    finally:
-        db.close()
 
 
 # =============================================================================
@@ -1557,16 +1783,12 @@ def list_races() -> list:
     Use this to see what races exist before creating NPCs or when storytelling
     involves racial dynamics (e.g., encountering orcs, elves, etc.)
     """
-    db = SessionLocal()
-    try:
-        races = db.query(Race).all()
-        return [{
-            "id": r.id,
-            "name": r.name,
-            "description": r.description
-        } for r in races]
-    finally:
-        db.close()
+    def load():
+        with session_scope(read_only=True) as db:
+            rows = db.execute(select(Race.id, Race.name, Race.description)).mappings()
+            return [dict(r) for r in rows]
+    
+    return load_committed(_listing_cache, current_step_session(), "races", load)
 
 
 @tool
@@ -1579,29 +1801,32 @@ def get_race_relationships(race_id: Optional[int] = None) -> list:
     Returns relationships with modifiers (-100 to 100) and reasons.
     Example: Dwarves and Elves might have -20 modifier due to ancient grudges.
     """
-    db = SessionLocal()
-    try:
-        query = db.query(RaceRelationship)
+    with session_scope(read_only=True) as db:
+        # Both race names joined in, instead of two lookups per relationship
+        source_race = aliased(Race)
+        target_race = aliased(Race)
+        query = (
+            select(source_race.name.label("source_race"), target_race.name.label("target_race"),
+                   RaceRelationship.base_relationship_modifier, RaceRelationship.reason)
+            .outerjoin(source_race, source_race.id == RaceRelationship.race_source_id)
+            .outerjoin(target_race, target_race.id == RaceRelationship.race_target_id)
+        )
         if race_id:
-            query = query.filter(
-                (RaceRelationship.race_source_id == race_id) | 
-                (RaceRelationship.race_target_id == race_id)
+            # One index seek per side (uq_race_relationship_pair's prefix, then
+            # ix_race_relationship_target) instead of an OR over both columns;
+            # a race's relationship with itself is only taken from the source side
+            query = union_all(
+                query.where(RaceRelationship.race_source_id == race_id),
+                query.where(RaceRelationship.race_target_id == race_id,
+                            RaceRelationship.race_source_id != race_id)
             )
-        relationships = query.all()
-        
-        results = []
-        for rel in relationships:
-            source = db.query(Race).filter(Race.id == rel.race_source_id).first()
-            target = db.query(Race).filter(Race.id == rel.race_target_id).first()
-            results.append({
-                "source_race": source.name if source else None,
-                "target_race": target.name if target else None,
-                "modifier": rel.base_relationship_modifier,
-                "reason": rel.reason
-            })
-        return results
-    finally:
-        db.close()
+        
+        return [{
+            "source_race": rel.source_race,
+            "target_race": rel.target_race,
+            "modifier": rel.base_relationship_modifier,
+            "reason": rel.reason
+        } for rel in db.execute(query).all()]
 
 
 @tool
@@ -1611,25 +1836,28 @@ def create_race(name: str, description: str) -> dict:
     Use when the story introduces a race that doesn't exist yet (e.g., Orcs, Goblins).
     Check list_races() first to avoid duplicates!
     """
-    db = SessionLocal()
-    try:
-        # Check for existing
-        existing = db.query(Race).filter(Race.name.ilike(name)).first()
-        if existing:
-            return {"error": f"Race '{name}' already exists", "existing_id": existing.id}
-        
-        race = Race(name=name, description=description)
-        db.add(race)
-        db.commit()
-        db.refresh(race)
-        
+    with session_scope() as db:
+        # Insert unless the name exists in any case (ix_race_name_lower): one round trip
+        # for a new race; the existing race is only looked up on a collision
+        race_id = db.execute(
+            pg_insert(Race)
+            .values(name=name, description=description)
+            .on_conflict_do_nothing(index_elements=[func.lower(Race.name)])
+            .returning(Race.id)
+        ).scalar()
+        if race_id is None:
+            existing_id = db.execute(
+                select(Race.id).where(func.lower(Race.name) == name.lower())
+            ).scalar()
+            return {"error": f"Race '{name}' already exists", "existing_id": existing_id}
+        
+        # A Core INSERT fires no mapper events
+        drop_on_commit(db, _listing_cache, "races")
         return {
             "created": True,
-            "race_id": race.id,
-            "name": race.name
+            "race_id": race_id,
+            "name": name
         }
-    finally:
-        db.close()
 
 
 @tool
@@ -1645,48 +1873,53 @@ def update_race_relationship(source_race_id: int, target_race_id: int,
     
     This affects how NPCs of these races initially react to each other.
     """
-    db = SessionLocal()
     try:
-        # Validate races exist
-        source = db.query(Race).filter(Race.id == source_race_id).first()
-        target = db.query(Race).filter(Race.id == target_race_id).first()
-        if not source or not target:
-            return {"error": "One or both races not found"}
-        
-        # Find existing or create new
-        rel = db.query(RaceRelationship).filter(
-            RaceRelationship.race_source_id == source_race_id,
-            RaceRelationship.race_target_id == target_race_id
-        ).first()
-        
-        if rel:
-            rel.base_relationship_modifier = modifier
-            if reason:
-                rel.reason = reason
-        else:
-            rel = RaceRelationship(
+        with session_scope() as db:
+            # Insert the pair or overwrite its modifier in one round trip; the race FKs
+            # validate both IDs and the race names come back with the row
+            stmt = pg_insert(RaceRelationship).values(
                 race_source_id=source_race_id,
                 race_target_id=target_race_id,
                 base_relationship_modifier=modifier,
-                reason=reason
+                reason=reason or None
             )
-            db.add(rel)
-        
-        db.commit()
-        
-        return {
-            "updated": True,
-            "source_race": source.name,
-            "target_race": target.name,
-            "modifier": modifier,
-            "reason": reason
-        }
-    finally:
-        db.close()
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[RaceRelationship.race_source_id, RaceRelationship.race_target_id],
+                set_={
+                    "base_relationship_modifier": stmt.excluded.base_relationship_modifier,
+                    "reason": func.coalesce(stmt.excluded.reason, RaceRelationship.reason)
+                }
+            ).returning(
+                select(Race.name).where(Race.id == source_race_id).scalar_subquery(),
+                select(Race.name).where(Race.id == target_race_id).scalar_subquery()
+            )
+            source_name, target_name = db.execute(stmt).one()
+    except IntegrityError as e:
+        # foreign_key_violation: one of the race IDs does not exist
+        if getattr(e.orig, "pgcode", None) != "23503":
+            raise
+        return {"error": "One or both races not found"}
+    
+    return {
+        "updated": True,
+        "source_race": source_name,
+        "target_race": target_name,
+        "modifier": modifier,
+        "reason": reason
+    }
 
 
 # ============= Combat Tools =============
 
+# Every combat tool looks up the player's active combat: one constant statement, so its
+# compiled form is always served from SQLAlchemy's statement cache (no per-call Query build)
+_ACTIVE_COMBAT_STMT = (
+    select(CombatSession)
+    .options(raiseload('*'))
+    .where(CombatSession.player_id == bindparam("player_id"), CombatSession.status == "active")
+    .limit(1)
+)
+
 @tool
 def initiate_combat(player_id: int, description: str,
                     player_team_ids: Optional[List[int]] = None,
@@ -1712,8 +1945,7 @@ def initiate_combat(player_id: int, description: str,
             enemy_team_ids=[10, 11],
         )
     """
-    db = SessionLocal()
-    try:
+    with session_scope() as db:
         if player_id <= 0:
             return {"error": "player_id must be a positive integer"}
 
@@ -1725,17 +1957,26 @@ def initiate_combat(player_id: int, description: str,
         if not isinstance(player_team_ids, list) or not isinstance(enemy_team_ids, list):
             return {"error": "player_team_ids and enemy_team_ids must be lists of integers"}
 
-        player = db.query(PlayerCharacter).filter(PlayerCharacter.id == player_id).first()
+        # Valid, distinct ids in the order given; an NPC listed on both sides fights as an enemy
+        enemy_team_ids = list(dict.fromkeys(i for i in enemy_team_ids if isinstance(i, int) and i > 0))
+        player_team_ids = list(dict.fromkeys(
+            i for i in player_team_ids
+            if isinstance(i, int) and i > 0 and i not in enemy_team_ids
+        ))
+
+        player = db.get(PlayerCharacter, player_id)
         if not player:
             return {"error": f"Player with id {player_id} not found"}
 
         if len(enemy_team_ids) == 0:
             nearby = []
             if player.current_location_id:
-                npcs = db.query(NonPlayerCharacter).filter(
-                    NonPlayerCharacter.location_id == player.current_location_id
-                ).all()
-                nearby = [{"id": n.id, "name": n.name, "type": n.npc_type} for n in npcs]
+                # Only the three columns listed, not full NPC rows
+                nearby = [dict(r) for r in db.execute(
+                    select(NonPlayerCharacter.id, NonPlayerCharacter.name,
+                           NonPlayerCharacter.npc_type.label("type"))
+                    .where(NonPlayerCharacter.location_id == player.current_location_id)
+                ).mappings()]
             return {
                 "error": "enemy_team_ids is required and must contain at least one NPC id",
                 "example": {
@@ -1748,10 +1989,7 @@ def initiate_combat(player_id: int, description: str,
             }
 
         # Check for existing active combat
-        existing = db.query(CombatSession).filter(
-            CombatSession.player_id == player_id,
-            CombatSession.status == "active"
-        ).first()
+        existing = db.execute(_ACTIVE_COMBAT_STMT, {"player_id": player_id}).scalar()
         if existing:
             return {
                 "error": "ALREADY IN COMBAT! Do NOT call initiate_combat again.",
@@ -1769,10 +2007,18 @@ def initiate_combat(player_id: int, description: str,
             "role": "player"
         }]
 
+        # Stats of every listed NPC (allies and enemies) in one SELECT
+        npc_ids = player_team_ids + enemy_team_ids
+        npcs = {}
+        if npc_ids:
+            npcs = {npc.id: npc for npc in db.execute(
+                select(NonPlayerCharacter.id, NonPlayerCharacter.name,
+                       NonPlayerCharacter.health, NonPlayerCharacter.max_health)
+                .where(NonPlayerCharacter.id.in_(npc_ids))
+            ).all()}
+
         for npc_id in player_team_ids:
-            if not isinstance(npc_id, int) or npc_id <= 0:
-                continue
-            npc = db.query(NonPlayerCharacter).filter(NonPlayerCharacter.id == npc_id).first()
+            npc = npcs.get(npc_id)
             if npc:
                 team_player.append({
                     "type": "NPC", "id": npc.id, "name": npc.name,
@@ -1783,9 +2029,7 @@ def initiate_combat(player_id: int, description: str,
         # Build enemy team with full stats
         team_enemy = []
         for npc_id in enemy_team_ids:
-            if not isinstance(npc_id, int) or npc_id <= 0:
-                continue
-            npc = db.query(NonPlayerCharacter).filter(NonPlayerCharacter.id == npc_id).first()
+            npc = npcs.get(npc_id)
             if npc:
                 team_enemy.append({
                     "type": "NPC", "id": npc.id, "name": npc.name,
@@ -1805,8 +2049,8 @@ def initiate_combat(player_id: int, description: str,
             team_enemy=team_enemy
         )
         db.add(combat)
-        db.commit()
-        db.refresh(combat)
+        # The flush's INSERT ... RETURNING assigns combat.id; nothing else is read back
+        db.flush()
         
         return {
             "combat_started": True,
@@ -1816,11 +2060,10 @@ def initiate_combat(player_id: int, description: str,
             "enemy_team": team_enemy,
             "message": "Combat initiated! Track damage with update_player_health/update_npc_health. Use add_combatant/remove_combatant to modify teams. End with end_combat."
         }
-    finally:
-        db.close()
 
 
 @tool
+@cached_result
 def get_active_combat(player_id: int) -> dict:
     """Get the current active combat for a player, if any.
 
@@ -1830,28 +2073,24 @@ def get_active_combat(player_id: int) -> dict:
     Returns:
         Combat state with both teams and their current HP.
     """
-    db = SessionLocal()
-    try:
+    with session_scope(read_only=True) as db:
         if player_id <= 0:
             return {"error": "player_id must be a positive integer"}
 
-        combat = db.query(CombatSession).filter(
-            CombatSession.player_id == player_id,
-            CombatSession.status == "active"
-        ).first()
+        combat = db.execute(_ACTIVE_COMBAT_STMT, {"player_id": player_id}).scalar()
         
         if not combat:
             return {"in_combat": False}
         
+        # Copies: the result is cached, while the combat tools patch the session's
+        # team lists (and their member dicts) in place
         return {
             "in_combat": True,
             "combat_id": combat.id,
             "description": combat.description,
-            "player_team": combat.team_player,
-            "enemy_team": combat.team_enemy
+            "player_team": [dict(member) for member in (combat.team_player or [])],
+            "enemy_team": [dict(member) for member in (combat.team_enemy or [])]
         }
-    finally:
-        db.close()
 
 
 @tool
@@ -1868,8 +2107,7 @@ def add_combatant(player_id: int, char_type: str, char_id: int, team: str) -> di
     Example:
         add_combatant(player_id=1, char_type="NPC", char_id=15, team="enemy")
     """
-    db = SessionLocal()
-    try:
+    with session_scope() as db:
         if player_id <= 0:
             return {"error": "player_id must be a positive integer"}
         if team not in ("player", "enemy"):
@@ -1879,45 +2117,39 @@ def add_combatant(player_id: int, char_type: str, char_id: int, team: str) -> di
         if char_id <= 0:
             return {"error": "char_id must be a positive integer"}
 
-        combat = db.query(CombatSession).filter(
-            CombatSession.player_id == player_id,
-            CombatSession.status == "active"
-        ).first()
+        combat = db.execute(_ACTIVE_COMBAT_STMT, {"player_id": player_id}).scalar()
         
         if not combat:
             return {"error": "No active combat"}
         
         # Check if already in combat
-        if combat.get_combatant(char_type, char_id):
+        if combat.find_combatant(char_type, char_id):
             return {"error": f"{char_type} {char_id} is already in combat"}
         
-        # Get character stats
-        member = None
-        if char_type == "PC":
-            pc = db.query(PlayerCharacter).filter(PlayerCharacter.id == char_id).first()
-            if pc:
-                member = {"type": "PC", "id": pc.id, "name": pc.name,
-                         "hp": pc.health, "max_hp": pc.max_health, "role": "player" if team == "player" else "enemy"}
-        elif char_type == "NPC":
-            npc = db.query(NonPlayerCharacter).filter(NonPlayerCharacter.id == char_id).first()
-            if npc:
-                member = {"type": "NPC", "id": npc.id, "name": npc.name,
-                         "hp": npc.health, "max_hp": npc.max_health, "role": "ally" if team == "player" else "enemy"}
-        
-        if not member:
+        # Get character stats (only the columns the tracker stores)
+        character = PlayerCharacter if char_type == "PC" else NonPlayerCharacter
+        stats = db.execute(
+            select(character.id, character.name, character.health, character.max_health)
+            .where(character.id == char_id)
+        ).first()
+        if not stats:
             return {"error": f"{char_type} {char_id} not found"}
         
-        # Add to appropriate team
         if team == "player":
-            team_list = list(combat.team_player or [])
-            team_list.append(member)
-            combat.team_player = team_list
+            role = "player" if char_type == "PC" else "ally"
         else:
-            team_list = list(combat.team_enemy or [])
-            team_list.append(member)
-            combat.team_enemy = team_list
-        
-        db.commit()
+            role = "enemy"
+        member = {"type": char_type, "id": stats.id, "name": stats.name,
+                  "hp": stats.health, "max_hp": stats.max_health, "role": role}
+        
+        # Append to the team's list in place; flag_modified marks the JSONB column dirty
+        team_attr = "team_player" if team == "player" else "team_enemy"
+        members = getattr(combat, team_attr)
+        if members is None:
+            setattr(combat, team_attr, [member])
+        else:
+            members.append(member)
+            flag_modified(combat, team_attr)
         
         return {
             "added": True,
@@ -1925,8 +2157,6 @@ def add_combatant(player_id: int, char_type: str, char_id: int, team: str) -> di
             "team": team,
             "combat_id": combat.id
         }
-    finally:
-        db.close()
 
 
 @tool
@@ -1939,8 +2169,7 @@ def remove_combatant(player_id: int, char_type: str, char_id: int, reason: str =
         char_id: The ID of the character to remove (PC id or NPC id depending on char_type).
         reason: Why they left ("fled", "captured", "retreated", "died").
     """
-    db = SessionLocal()
-    try:
+    with session_scope() as db:
         if player_id <= 0:
             return {"error": "player_id must be a positive integer"}
         if char_type not in ("PC", "NPC"):
@@ -1948,47 +2177,28 @@ def remove_combatant(player_id: int, char_type: str, char_id: int, reason: str =
         if char_id <= 0:
             return {"error": "char_id must be a positive integer"}
 
-        combat = db.query(CombatSession).filter(
-            CombatSession.player_id == player_id,
-            CombatSession.status == "active"
-        ).first()
+        combat = db.execute(_ACTIVE_COMBAT_STMT, {"player_id": player_id}).scalar()
         
         if not combat:
             return {"error": "No active combat"}
         
-        # Find and remove from player team
+        # Find the combatant in either team (one pass) and remove it in place
+        found = combat.find_combatant(char_type, char_id)
         removed_name = None
-        team_player = list(combat.team_player or [])
-        for i, m in enumerate(team_player):
-            if m.get("type") == char_type and m.get("id") == char_id:
-                removed_name = m.get("name")
-                team_player.pop(i)
-                combat.team_player = team_player
-                break
-        
-        # Find and remove from enemy team
-        if not removed_name:
-            team_enemy = list(combat.team_enemy or [])
-            for i, m in enumerate(team_enemy):
-                if m.get("type") == char_type and m.get("id") == char_id:
-                    removed_name = m.get("name")
-                    team_enemy.pop(i)
-                    combat.team_enemy = team_enemy
-                    break
+        if found:
+            team_attr, i = found
+            removed_name = getattr(combat, team_attr).pop(i).get("name")
+            flag_modified(combat, team_attr)
         
         if not removed_name:
             return {"error": f"{char_type} {char_id} not found in combat"}
         
-        db.commit()
-        
         return {
             "removed": True,
             "name": removed_name,
             "reason": reason,
             "combat_id": combat.id
         }
-    finally:
-        db.close()
 
 
 @tool
@@ -2008,8 +2218,7 @@ def update_combat_hp(player_id: int, char_type: str, char_id: int, new_hp: int)
         char_id: The ID of the combatant (PC id or NPC id depending on char_type).
         new_hp: New HP value (will be clamped to >= 0).
     """
-    db = SessionLocal()
-    try:
+    with session_scope() as db:
         if player_id <= 0:
             return {"error": "player_id must be a positive integer"}
         if char_type not in ("PC", "NPC"):
@@ -2017,47 +2226,32 @@ def update_combat_hp(player_id: int, char_type: str, char_id: int, new_hp: int)
         if char_id <= 0:
             return {"error": "char_id must be a positive integer"}
 
-        combat = db.query(CombatSession).filter(
-            CombatSession.player_id == player_id,
-            CombatSession.status == "active"
-        ).first()
+        combat = db.execute(_ACTIVE_COMBAT_STMT, {"player_id": player_id}).scalar()
         
         if not combat:
             return {"error": "No active combat"}
         
-        # Update actual character
-        if char_type == "PC":
-            char = db.query(PlayerCharacter).filter(PlayerCharacter.id == char_id).first()
-            if char:
-                char.health = max(0, new_hp)
-        elif char_type == "NPC":
-            char = db.query(NonPlayerCharacter).filter(NonPlayerCharacter.id == char_id).first()
-            if char:
-                char.health = max(0, new_hp)
-        
-        # Update combat tracker
+        # Update combat tracker in place
+        found = combat.find_combatant(char_type, char_id)
         updated_name = None
-        team_player = list(combat.team_player or [])
-        for m in team_player:
-            if m.get("type") == char_type and m.get("id") == char_id:
-                m["hp"] = max(0, new_hp)
-                updated_name = m.get("name")
-                combat.team_player = team_player
-                break
-        
-        if not updated_name:
-            team_enemy = list(combat.team_enemy or [])
-            for m in team_enemy:
-                if m.get("type") == char_type and m.get("id") == char_id:
-                    m["hp"] = max(0, new_hp)
-                    updated_name = m.get("name")
-                    combat.team_enemy = team_enemy
-                    break
+        if found:
+            team_attr, i = found
+            member = getattr(combat, team_attr)[i]
+            member["hp"] = max(0, new_hp)
+            updated_name = member.get("name")
+            flag_modified(combat, team_attr)
         
         if not updated_name:
             return {"error": f"{char_type} {char_id} not found in combat"}
         
-        db.commit()
+        # Update actual character (only once the tracker is known to hold it);
+        # a plain UPDATE, the row itself isn't needed
+        character = PlayerCharacter if char_type == "PC" else NonPlayerCharacter
+        db.execute(
+            update(character)
+            .where(character.id == char_id)
+            .values(health=max(0, new_hp))
+        )
         
         status = "DOWN" if new_hp <= 0 else "standing"
         return {
@@ -2066,8 +2260,6 @@ def update_combat_hp(player_id: int, char_type: str, char_id: int, new_hp: int)
             "new_hp": max(0, new_hp),
             "status": status
         }
-    finally:
-        db.close()
 
 
 @tool
@@ -2086,15 +2278,11 @@ def end_combat(player_id: int, outcome: str, summary: str) -> dict:
     Returns:
         Final combat state and confirmation.
     """
-    db = SessionLocal()
-    try:
+    with session_scope() as db:
         if player_id <= 0:
             return {"error": "player_id must be a positive integer"}
 
-        combat = db.query(CombatSession).filter(
-            CombatSession.player_id == player_id,
-            CombatSession.status == "active"
-        ).first()
+        combat = db.execute(_ACTIVE_COMBAT_STMT, {"player_id": player_id}).scalar()
         
         if not combat:
             return {"error": "No active combat to end"}
@@ -2105,9 +2293,8 @@ def end_combat(player_id: int, outcome: str, summary: str) -> dict:
         combat.summary = summary
         combat.ended_at = datetime.utcnow()
         
-        db.commit()
-        
-        # Compress combat messages into a single summary
+        # Compress combat messages into a single summary, in this session: the combat
+        # and the story log are committed together
         story_manager = get_story_manager()
         combat_tag = f"combat:{combat_id}"
         
@@ -2118,7 +2305,8 @@ def end_combat(player_id: int, outcome: str, summary: str) -> dict:
             player_id=player_id,
             tag=combat_tag,
             summary=compressed_summary,
-            summary_tags=[f"combat:{combat_id}:summary", "combat_summary", f"combat_outcome:{outcome}"]
+            summary_tags=[f"combat:{combat_id}:summary", "combat_summary", f"combat_outcome:{outcome}"],
+            db=db
         )
         
         return {
@@ -2130,77 +2318,81 @@ def end_combat(player_id: int, outcome: str, summary: str) -> dict:
             "final_enemy_team": combat.team_enemy,
             "messages_compressed": messages_compressed
         }
-    finally:
-        db.close()
+
+
+# Built once at import; every GameMasterAgent shares the same list
+_GAME_TOOLS = [
+    # Query tools
+    get_player_info,
+    get_location_info,
+    get_npc_info,
+    get_npcs_at_location,
+    get_relationship,
+    get_player_quests,
+    list_item_templates,
+    # Inventory query tools (IMPORTANT: use these to get instance_ids)
+    get_items_at_location,
+    get_player_inventory,
+    get_npc_inventory,
+    # Long-term memory (search past sessions)
+    search_memories,
+    recall_session_details,
+    # Player management
+    update_player_health,
+    update_player_gold,
+    update_player_experience,
+    move_player,
+    # Item transfer (use instance_id from inventory queries)
+    pickup_item,
+    drop_item,
+    transfer_item,
+    consume_item_instance,
+    # Item creation (creates NEW items - use sparingly for rewards/loot)
+    create_item_for_player,
+    create_items_for_player,
+    create_item_for_npc,
+    spawn_item_at_location,
+    spawn_items_at_location,
+    # NPC management
+    move_npc,
+    update_npc_health,
+    update_npc_behavior,
+    update_npc_disposition,
+    create_npc,
+    # Companion management
+    set_companion_follow,
+    dismiss_companion,
+    get_player_companions,
+    # Relationship management
+    update_relationship,
+    # Quest management
+    create_quest,
+    update_quest_status,
+    # World building
+    list_locations,
+    create_location,
+    create_item_template,
+    # Region management
+    get_region_info,
+    list_regions,
+    create_region,
+    update_region,
+    assign_location_to_region,
+    # Race management
+    list_races,
+    get_race_relationships,
+    create_race,
+    update_race_relationship,
+    # Combat management
+    initiate_combat,
+    get_active_combat,
+    add_combatant,
+    remove_combatant,
+    update_combat_hp,
+    end_combat
+]
 
 
 def get_game_tools():
     """Return all tools available to the Game Master agent."""
-    return [
-        # Query tools
-        get_player_info,
-        get_location_info,
-        get_npc_info,
-        get_npcs_at_location,
-        get_relationship,
-        get_player_quests,
-        list_item_templates,
-        # Inventory query tools (IMPORTANT: use these to get instance_ids)
-        get_items_at_location,
-        get_player_inventory,
-        get_npc_inventory,
-        # Long-term memory (search past sessions)
-        search_memories,
-        recall_session_details,
-        # Player management
-        update_player_health,
-        update_player_gold,
-        update_player_experience,
-        move_player,
-        # Item transfer (use instance_id from inventory queries)
-        pickup_item,
-        drop_item,
-        transfer_item,
-        consume_item_instance,
-        # Item creation (creates NEW items - use sparingly for rewards/loot)
-        create_item_for_player,
-        create_item_for_npc,
-        spawn_item_at_location,
-        # NPC management
-        move_npc,
-        update_npc_health,
-        update_npc_behavior,
-        update_npc_disposition,
-        create_npc,
-        # Companion management
-        set_companion_follow,
-        dismiss_companion,
-        get_player_companions,
-        # Relationship management
-        update_relationship,
-        # Quest management
-        create_quest,
-        update_quest_status,
-        # World building
-        list_locations,
-        create_location,
-        create_item_template,
-        # Region management
-        get_region_info,
-        list_regions,
-        create_region,
-        update_region,
-        assign_location_to_region,
-        # Race management
-        list_races,
-        get_race_relationships,
-        create_race,
-        update_race_relationship,
-        # Combat management
-        initiate_combat,
-        get_active_combat,
-        add_combatant,
-        remove_combatant,
-        update_combat_hp,
-        end_combat
-    ]
+    return _GAME_TOOLS
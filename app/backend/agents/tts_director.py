@@ -13,9 +13,10 @@ the database.
 TODO: When adding non-Gemini TTS providers, generalise the director model
 selection to support other providers via build_llm / llm_factory.
 """
+import functools
 import json
 import logging
-from collections import OrderedDict
+import re
 from typing import Optional
 
 from google import genai
@@ -65,25 +66,44 @@ VOICE_POOL = {
 }
 
 
+# Per gender, built once: trait → (position in the pool, voice name), and one pattern
+# finding every trait occurrence in a mood (lookahead, so overlapping traits are all seen)
+_VOICE_BY_TRAIT = {
+    gender: {trait: (rank, voice_name) for rank, (voice_name, trait) in enumerate(pool)}
+    for gender, pool in VOICE_POOL.items()
+}
+_VOICE_TRAIT_PATTERN = {
+    gender: re.compile("(?=(" + "|".join(re.escape(trait) for trait in by_trait) + "))")
+    for gender, by_trait in _VOICE_BY_TRAIT.items()
+}
+
+
 def _pick_voice(gender: str, mood: str, default_voice: str) -> str:
     """Pick the best voice from the pool based on gender and mood keywords.
 
     Falls back to the configured default voice for that gender.
     """
-    pool = VOICE_POOL.get(gender, VOICE_POOL["male"])
+    if gender not in VOICE_POOL:
+        gender = "male"
 
-    # Simple keyword matching: find a voice whose trait appears in the mood
-    mood_lower = (mood or "").lower()
-    for voice_name, trait in pool:
-        if trait in mood_lower:
-            return voice_name
+    # Keyword matching in one scan of the mood; when several traits appear,
+    # the voice listed first in the pool wins
+    traits = _VOICE_TRAIT_PATTERN[gender].findall((mood or "").lower())
+    if traits:
+        by_trait = _VOICE_BY_TRAIT[gender]
+        return min(by_trait[trait] for trait in traits)[1]
 
     # No mood match — return the configured default
     return default_voice
 
 
-def _build_genai_client() -> genai.Client:
-    """Build a google-genai Client using the Gemini API key."""
+@functools.lru_cache(maxsize=1)
+def get_genai_client() -> genai.Client:
+    """Return the shared google-genai Client (built on first use from the Gemini API key).
+
+    One client serves every director and TTS call, so its HTTP connection pool
+    (and the TLS sessions in it) is reused across requests.
+    """
     api_key = (settings.GEMINI_API_KEY or "").strip()
     if not api_key:
         raise ValueError("GEMINI_API_KEY is required for TTS")
@@ -95,8 +115,8 @@ def get_voice_history(player_id: Optional[int]) -> list[dict]:
     if player_id is None:
         return []
     history = _voice_history.get(player_id, [])
-    # Flatten + deduplicate keeping latest
-    seen: OrderedDict[str, str] = OrderedDict()
+    # Flatten + deduplicate keeping latest (a plain dict keeps insertion order)
+    seen: dict[str, str] = {}
     for batch in history:
         for entry in batch:
             seen[entry["speaker"]] = entry["voice"]
@@ -135,7 +155,7 @@ def transform_for_tts(
             ]
         }
     """
-    client = _build_genai_client()
+    client = get_genai_client()
     model = settings.TTS_DIRECTOR_MODEL
 
     logger.info(f"[TTS-DIR] Transforming {len(gm_text)} chars with {model}")
@@ -243,26 +263,27 @@ def resolve_voices(
     for seg in script.get("segments", []):
         seg = dict(seg)  # shallow copy
         speaker = seg["speaker"]
+        speaker_key = speaker.lower()  # every lookup below is keyed by the lowered name
 
         if speaker == "Narrator":
             seg["voice"] = narrator_voice
-        elif speaker.lower() in speaker_lock:
+        elif speaker_key in speaker_lock:
             # Already resolved this speaker in this message
-            seg["voice"] = speaker_lock[speaker.lower()]
+            seg["voice"] = speaker_lock[speaker_key]
         else:
             gender = seg.get("gender", "male")
             default = default_female if gender == "female" else default_male
             voice = None
 
             # Priority 1: NPC has stored voice in DB
-            npc_info = npc_lookup.get(speaker.lower())
+            npc_info = npc_lookup.get(speaker_key)
             if npc_info and npc_info.get("voice"):
                 voice = npc_info["voice"]
                 logger.debug(f"[TTS-DIR] {speaker}: using stored voice '{voice}'")
 
             # Priority 2: Voice history from recent messages
-            if not voice and speaker.lower() in hist_lookup:
-                voice = hist_lookup[speaker.lower()]
+            if not voice and speaker_key in hist_lookup:
+                voice = hist_lookup[speaker_key]
                 logger.debug(f"[TTS-DIR] {speaker}: using history voice '{voice}'")
 
             # Priority 3: Pick from mood pool
@@ -279,7 +300,7 @@ def resolve_voices(
                     logger.info(f"[TTS-DIR] Auto-assigning voice '{voice}' to NPC {speaker} (id={npc_info['npc_id']})")
 
             seg["voice"] = voice
-            speaker_lock[speaker.lower()] = voice
+            speaker_lock[speaker_key] = voice
 
         resolved.append(seg)
 
@@ -8,17 +8,16 @@ batch's WAV audio to the frontend for low-latency playback.
 TODO: When adding non-Gemini TTS providers, abstract this behind a common
 TTS interface and add provider-specific implementations.
 """
-import io
 import logging
 import struct
-import wave
+from concurrent.futures import ThreadPoolExecutor
 from typing import Generator, Optional
 
 from google import genai
 from google.genai import types as genai_types
 
 from config import settings
-from agents.tts_director import transform_for_tts, resolve_voices
+from agents.tts_director import get_genai_client, transform_for_tts, resolve_voices
 
 logger = logging.getLogger(__name__)
 
@@ -28,23 +27,22 @@ SAMPLE_WIDTH = 2  # 16-bit
 CHANNELS = 1
 
 
-def _build_genai_client() -> genai.Client:
-    """Build a google-genai Client using the Gemini API key."""
-    api_key = (settings.GEMINI_API_KEY or "").strip()
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY is required for TTS")
-    return genai.Client(api_key=api_key)
-
-
 def _pcm_to_wav(pcm_data: bytes) -> bytes:
-    """Wrap raw PCM bytes in a WAV header."""
-    buf = io.BytesIO()
-    with wave.open(buf, "wb") as wf:
-        wf.setnchannels(CHANNELS)
-        wf.setsampwidth(SAMPLE_WIDTH)
-        wf.setframerate(SAMPLE_RATE)
-        wf.writeframes(pcm_data)
-    return buf.getvalue()
+    """Wrap raw PCM bytes in a WAV header.
+
+    The 44-byte RIFF/fmt/data header is packed directly (the same bytes the
+    wave module writes), so the PCM is copied once instead of through a BytesIO.
+    """
+    header = struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + len(pcm_data), b"WAVE",
+        b"fmt ", 16, 1, CHANNELS, SAMPLE_RATE,
+        SAMPLE_RATE * CHANNELS * SAMPLE_WIDTH,  # byte rate
+        CHANNELS * SAMPLE_WIDTH,                # block align
+        8 * SAMPLE_WIDTH,                       # bits per sample
+        b"data", len(pcm_data),
+    )
+    return header + pcm_data
 
 
 def _build_tts_prompt(segments: list[dict]) -> str:
@@ -233,18 +231,29 @@ def generate_tts_stream(
     batches = _group_into_batches(segments)
     logger.info(f"[TTS] {len(segments)} segments → {len(batches)} streaming batches")
 
-    # Step 4: Generate and stream each batch
-    client = _build_genai_client()
+    # Step 4: Generate the batches concurrently and stream them in script order.
+    # Each Gemini call is network-bound, so the total time approaches the slowest
+    # call instead of the sum of all of them; the first chunk is not delayed.
+    client = get_genai_client()
     model = settings.TTS_MODEL
 
-    for i, batch in enumerate(batches):
-        logger.debug(f"[TTS] Generating batch {i+1}/{len(batches)} ({len(batch)} segments)")
-        pcm = _generate_audio_for_batch(client, batch, model)
-        wav = _pcm_to_wav(pcm)
-        # Length-prefix so the frontend can parse the chunk boundary
-        yield struct.pack('>I', len(wav))
-        yield wav
-        logger.debug(f"[TTS] Streamed batch {i+1}/{len(batches)} ({len(wav)} bytes)")
+    workers = max(1, min(len(batches), settings.TTS_MAX_PARALLEL_BATCHES))
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts")
+    try:
+        futures = [
+            executor.submit(_generate_audio_for_batch, client, batch, model)
+            for batch in batches
+        ]
+        for i, future in enumerate(futures):
+            pcm = future.result()
+            wav = _pcm_to_wav(pcm)
+            # Length-prefix so the frontend can parse the chunk boundary
+            yield struct.pack('>I', len(wav))
+            yield wav
+            logger.debug(f"[TTS] Streamed batch {i+1}/{len(batches)} ({len(wav)} bytes)")
+    finally:
+        # On a failed batch or a closed stream (client went away), drop the calls not started yet
+        executor.shutdown(wait=False, cancel_futures=True)
 
 
 def is_tts_available() -> bool:
@@ -48,7 +48,7 @@ def get_relationships(
 
 @router.get("/{relationship_id}", response_model=CharacterRelationshipResponse)
 def get_relationship(relationship_id: int, db: Session = Depends(get_db)):
-    relationship = db.query(CharacterRelationship).filter(CharacterRelationship.id == relationship_id).first()
+    relationship = db.get(CharacterRelationship, relationship_id)
     if not relationship:
         raise HTTPException(status_code=404, detail="Relationship not found")
     return relationship
@@ -100,7 +100,7 @@ def update_relationship(
     relationship: CharacterRelationshipCreate, 
     db: Session = Depends(get_db)
 ):
-    db_relationship = db.query(CharacterRelationship).filter(CharacterRelationship.id == relationship_id).first()
+    db_relationship = db.get(CharacterRelationship, relationship_id)
     if not db_relationship:
         raise HTTPException(status_code=404, detail="Relationship not found")
     
@@ -113,7 +113,7 @@ def update_relationship(
 
 @router.delete("/{relationship_id}")
 def delete_relationship(relationship_id: int, db: Session = Depends(get_db)):
-    db_relationship = db.query(CharacterRelationship).filter(CharacterRelationship.id == relationship_id).first()
+    db_relationship = db.get(CharacterRelationship, relationship_id)
     if not db_relationship:
         raise HTTPException(status_code=404, detail="Relationship not found")
     
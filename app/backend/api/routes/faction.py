@@ -22,14 +22,14 @@ def get_factions(skip: int = 0, limit: int = 100, db: Session = Depends(get_db))
 
 @router.get("/{faction_id}", response_model=FactionResponse)
 def get_faction(faction_id: int, db: Session = Depends(get_db)):
-    faction = db.query(Faction).filter(Faction.id == faction_id).first()
+    faction = db.get(Faction, faction_id)
     if not faction:
         raise HTTPException(status_code=404, detail="Faction not found")
     return faction
 
 @router.put("/{faction_id}", response_model=FactionResponse)
 def update_faction(faction_id: int, faction: FactionCreate, db: Session = Depends(get_db)):
-    db_faction = db.query(Faction).filter(Faction.id == faction_id).first()
+    db_faction = db.get(Faction, faction_id)
     if not db_faction:
         raise HTTPException(status_code=404, detail="Faction not found")
     
@@ -42,7 +42,7 @@ def update_faction(faction_id: int, faction: FactionCreate, db: Session = Depend
 
 @router.delete("/{faction_id}")
 def delete_faction(faction_id: int, db: Session = Depends(get_db)):
-    db_faction = db.query(Faction).filter(Faction.id == faction_id).first()
+    db_faction = db.get(Faction, faction_id)
     if not db_faction:
         raise HTTPException(status_code=404, detail="Faction not found")
     
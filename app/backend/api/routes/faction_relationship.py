@@ -22,7 +22,7 @@ def get_faction_relationships(skip: int = 0, limit: int = 100, db: Session = Dep
 
 @router.get("/{relationship_id}", response_model=FactionRelationshipResponse)
 def get_faction_relationship(relationship_id: int, db: Session = Depends(get_db)):
-    relationship = db.query(FactionRelationship).filter(FactionRelationship.id == relationship_id).first()
+    relationship = db.get(FactionRelationship, relationship_id)
     if not relationship:
         raise HTTPException(status_code=404, detail="Faction relationship not found")
     return relationship
@@ -39,7 +39,7 @@ def get_faction_relationship_between(faction_source_id: int, faction_target_id:
 
 @router.put("/{relationship_id}", response_model=FactionRelationshipResponse)
 def update_faction_relationship(relationship_id: int, relationship: FactionRelationshipCreate, db: Session = Depends(get_db)):
-    db_relationship = db.query(FactionRelationship).filter(FactionRelationship.id == relationship_id).first()
+    db_relationship = db.get(FactionRelationship, relationship_id)
     if not db_relationship:
         raise HTTPException(status_code=404, detail="Faction relationship not found")
     
@@ -52,7 +52,7 @@ def update_faction_relationship(relationship_id: int, relationship: FactionRelat
 
 @router.delete("/{relationship_id}")
 def delete_faction_relationship(relationship_id: int, db: Session = Depends(get_db)):
-    db_relationship = db.query(FactionRelationship).filter(FactionRelationship.id == relationship_id).first()
+    db_relationship = db.get(FactionRelationship, relationship_id)
     if not db_relationship:
         raise HTTPException(status_code=404, detail="Faction relationship not found")
     
@@ -89,7 +89,7 @@ def game_chat(request: ChatRequest, db: Session = Depends(get_db)):
     - Generate immersive narrative responses
     - Update game state (health, gold, relationships, etc.) as needed
     """
-    player = db.query(PlayerCharacter).filter(PlayerCharacter.id == request.player_id).first()
+    player = db.get(PlayerCharacter, request.player_id)
     if not player:
         raise HTTPException(status_code=404, detail=f"Player with id {request.player_id} not found")
     
@@ -169,7 +169,7 @@ def start_game_session(request: StartSessionRequest, db: Session = Depends(get_d
     
     Generates an intro based on player's backstory and current state.
     """
-    player = db.query(PlayerCharacter).filter(PlayerCharacter.id == request.player_id).first()
+    player = db.get(PlayerCharacter, request.player_id)
     if not player:
         raise HTTPException(status_code=404, detail=f"Player with id {request.player_id} not found")
     
@@ -213,7 +213,7 @@ def handle_autocomplete(request: AutocompleteRequest, db: Session = Depends(get_
     - Empty input: suggests a contextually appropriate action
     - With input: polishes rough idea into narrative prose
     """
-    player = db.query(PlayerCharacter).filter(PlayerCharacter.id == request.player_id).first()
+    player = db.get(PlayerCharacter, request.player_id)
     if not player:
         raise HTTPException(status_code=404, detail=f"Player with id {request.player_id} not found")
     
@@ -245,7 +245,7 @@ def roll_dice(request: DiceRollRequest, db: Session = Depends(get_db)):
     - Regular roll: Just returns the dice result
     - Use luck: Spends 1 luck point to reroll (requires luck > 0)
     """
-    player = db.query(PlayerCharacter).filter(PlayerCharacter.id == request.player_id).first()
+    player = db.get(PlayerCharacter, request.player_id)
     if not player:
         raise HTTPException(status_code=404, detail=f"Player with id {request.player_id} not found")
     
@@ -291,7 +291,7 @@ def get_combat_state(player_id: int, db: Session = Depends(get_db)):
 
     Used by the frontend to render a combat HUD (teams, HP bars, down/alive).
     """
-    player = db.query(PlayerCharacter).filter(PlayerCharacter.id == player_id).first()
+    player = db.get(PlayerCharacter, player_id)
     if not player:
         raise HTTPException(status_code=404, detail=f"Player with id {player_id} not found")
 
@@ -316,13 +316,13 @@ def get_combat_state(player_id: int, db: Session = Depends(get_db)):
         max_hp = member.get("max_hp", member.get("max_health"))
 
         if char_type == "PC" and isinstance(char_id, int):
-            pc = db.query(PlayerCharacter).filter(PlayerCharacter.id == char_id).first()
+            pc = db.get(PlayerCharacter, char_id)
             if pc:
                 name = pc.name
                 hp = pc.health
                 max_hp = pc.max_health
         elif char_type == "NPC" and isinstance(char_id, int):
-            npc = db.query(NonPlayerCharacter).filter(NonPlayerCharacter.id == char_id).first()
+            npc = db.get(NonPlayerCharacter, char_id)
             if npc:
                 name = npc.name
                 hp = npc.health
@@ -362,7 +362,7 @@ def get_player_story(player_id: int, limit: int = 50, db: Session = Depends(get_
     
     Returns all messages in chronological order with their roles, tags, and timestamps.
     """
-    player = db.query(PlayerCharacter).filter(PlayerCharacter.id == player_id).first()
+    player = db.get(PlayerCharacter, player_id)
     if not player:
         raise HTTPException(status_code=404, detail=f"Player with id {player_id} not found")
     
@@ -382,7 +382,7 @@ def clear_player_story(player_id: int, db: Session = Depends(get_db)):
     """
     Clear all story messages for a player (reset story).
     """
-    player = db.query(PlayerCharacter).filter(PlayerCharacter.id == player_id).first()
+    player = db.get(PlayerCharacter, player_id)
     if not player:
         raise HTTPException(status_code=404, detail=f"Player with id {player_id} not found")
     
@@ -406,7 +406,7 @@ def _build_npc_context(player_id: int, db: Session) -> list[dict]:
     Returns a list of dicts for the TTS Director:
         [{name, gender, voice, npc_id}, ...]
     """
-    player = db.query(PlayerCharacter).filter(PlayerCharacter.id == player_id).first()
+    player = db.get(PlayerCharacter, player_id)
     if not player:
         return []
 
@@ -41,7 +41,7 @@ def get_item_instances(
 
 @router.get("/{instance_id}", response_model=ItemInstanceResponse)
 def get_item_instance(instance_id: int, db: Session = Depends(get_db)):
-    instance = db.query(ItemInstance).filter(ItemInstance.id == instance_id).first()
+    instance = db.get(ItemInstance, instance_id)
     if not instance:
         raise HTTPException(status_code=404, detail="Item instance not found")
     return instance
@@ -66,7 +66,7 @@ def get_items_at_location(location_id: int, db: Session = Depends(get_db)):
 
 @router.put("/{instance_id}", response_model=ItemInstanceResponse)
 def update_item_instance(instance_id: int, instance: ItemInstanceCreate, db: Session = Depends(get_db)):
-    db_instance = db.query(ItemInstance).filter(ItemInstance.id == instance_id).first()
+    db_instance = db.get(ItemInstance, instance_id)
     if not db_instance:
         raise HTTPException(status_code=404, detail="Item instance not found")
     
@@ -85,7 +85,7 @@ def transfer_item(
     db: Session = Depends(get_db)
 ):
     """Transfer item ownership (e.g., trade, loot, drop)"""
-    db_instance = db.query(ItemInstance).filter(ItemInstance.id == instance_id).first()
+    db_instance = db.get(ItemInstance, instance_id)
     if not db_instance:
         raise HTTPException(status_code=404, detail="Item instance not found")
     
@@ -104,7 +104,7 @@ def enchant_item(
     db: Session = Depends(get_db)
 ):
     """Add or update enchantments on an item instance"""
-    db_instance = db.query(ItemInstance).filter(ItemInstance.id == instance_id).first()
+    db_instance = db.get(ItemInstance, instance_id)
     if not db_instance:
         raise HTTPException(status_code=404, detail="Item instance not found")
     
@@ -119,7 +119,7 @@ def enchant_item(
 
 @router.delete("/{instance_id}")
 def delete_item_instance(instance_id: int, db: Session = Depends(get_db)):
-    db_instance = db.query(ItemInstance).filter(ItemInstance.id == instance_id).first()
+    db_instance = db.get(ItemInstance, instance_id)
     if not db_instance:
         raise HTTPException(status_code=404, detail="Item instance not found")
     
@@ -30,14 +30,14 @@ def get_item_templates(
 
 @router.get("/{template_id}", response_model=ItemTemplateResponse)
 def get_item_template(template_id: int, db: Session = Depends(get_db)):
-    template = db.query(ItemTemplate).filter(ItemTemplate.id == template_id).first()
+    template = db.get(ItemTemplate, template_id)
     if not template:
         raise HTTPException(status_code=404, detail="Item template not found")
     return template
 
 @router.put("/{template_id}", response_model=ItemTemplateResponse)
 def update_item_template(template_id: int, template: ItemTemplateCreate, db: Session = Depends(get_db)):
-    db_template = db.query(ItemTemplate).filter(ItemTemplate.id == template_id).first()
+    db_template = db.get(ItemTemplate, template_id)
     if not db_template:
         raise HTTPException(status_code=404, detail="Item template not found")
     
@@ -50,7 +50,7 @@ def update_item_template(template_id: int, template: ItemTemplateCreate, db: Ses
 
 @router.delete("/{template_id}")
 def delete_item_template(template_id: int, db: Session = Depends(get_db)):
-    db_template = db.query(ItemTemplate).filter(ItemTemplate.id == template_id).first()
+    db_template = db.get(ItemTemplate, template_id)
     if not db_template:
         raise HTTPException(status_code=404, detail="Item template not found")
     
@@ -22,14 +22,14 @@ def get_locations(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)
 
 @router.get("/{location_id}", response_model=LocationResponse)
 def get_location(location_id: int, db: Session = Depends(get_db)):
-    location = db.query(Location).filter(Location.id == location_id).first()
+    location = db.get(Location, location_id)
     if not location:
         raise HTTPException(status_code=404, detail="Location not found")
     return location
 
 @router.put("/{location_id}", response_model=LocationResponse)
 def update_location(location_id: int, location: LocationCreate, db: Session = Depends(get_db)):
-    db_location = db.query(Location).filter(Location.id == location_id).first()
+    db_location = db.get(Location, location_id)
     if not db_location:
         raise HTTPException(status_code=404, detail="Location not found")
     
@@ -42,7 +42,7 @@ def update_location(location_id: int, location: LocationCreate, db: Session = De
 
 @router.delete("/{location_id}")
 def delete_location(location_id: int, db: Session = Depends(get_db)):
-    location = db.query(Location).filter(Location.id == location_id).first()
+    location = db.get(Location, location_id)
     if not location:
         raise HTTPException(status_code=404, detail="Location not found")
     
@@ -22,14 +22,14 @@ def get_npcs(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
 
 @router.get("/{npc_id}", response_model=NonPlayerCharacterResponse)
 def get_npc(npc_id: int, db: Session = Depends(get_db)):
-    npc = db.query(NonPlayerCharacter).filter(NonPlayerCharacter.id == npc_id).first()
+    npc = db.get(NonPlayerCharacter, npc_id)
     if not npc:
         raise HTTPException(status_code=404, detail="NPC not found")
     return npc
 
 @router.put("/{npc_id}", response_model=NonPlayerCharacterResponse)
 def update_npc(npc_id: int, npc: NonPlayerCharacterCreate, db: Session = Depends(get_db)):
-    db_npc = db.query(NonPlayerCharacter).filter(NonPlayerCharacter.id == npc_id).first()
+    db_npc = db.get(NonPlayerCharacter, npc_id)
     if not db_npc:
         raise HTTPException(status_code=404, detail="NPC not found")
     
@@ -42,7 +42,7 @@ def update_npc(npc_id: int, npc: NonPlayerCharacterCreate, db: Session = Depends
 
 @router.delete("/{npc_id}")
 def delete_npc(npc_id: int, db: Session = Depends(get_db)):
-    npc = db.query(NonPlayerCharacter).filter(NonPlayerCharacter.id == npc_id).first()
+    npc = db.get(NonPlayerCharacter, npc_id)
     if not npc:
         raise HTTPException(status_code=404, detail="NPC not found")
     
@@ -25,14 +25,14 @@ def get_player_characters(skip: int = 0, limit: int = 100, db: Session = Depends
 
 @router.get("/{character_id}", response_model=PlayerCharacterResponse)
 def get_player_character(character_id: int, db: Session = Depends(get_db)):
-    character = db.query(PlayerCharacter).filter(PlayerCharacter.id == character_id).first()
+    character = db.get(PlayerCharacter, character_id)
     if not character:
         raise HTTPException(status_code=404, detail="Player character not found")
     return character
 
 @router.put("/{character_id}", response_model=PlayerCharacterResponse)
 def update_player_character(character_id: int, character: PlayerCharacterCreate, db: Session = Depends(get_db)):
-    db_character = db.query(PlayerCharacter).filter(PlayerCharacter.id == character_id).first()
+    db_character = db.get(PlayerCharacter, character_id)
     if not db_character:
         raise HTTPException(status_code=404, detail="Player character not found")
     
@@ -45,7 +45,7 @@ def update_player_character(character_id: int, character: PlayerCharacterCreate,
 
 @router.delete("/{character_id}")
 def delete_player_character(character_id: int, db: Session = Depends(get_db)):
-    character = db.query(PlayerCharacter).filter(PlayerCharacter.id == character_id).first()
+    character = db.get(PlayerCharacter, character_id)
     if not character:
         raise HTTPException(status_code=404, detail="Player character not found")
     
@@ -22,14 +22,14 @@ def get_quests(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
 
 @router.get("/{quest_id}", response_model=QuestResponse)
 def get_quest(quest_id: int, db: Session = Depends(get_db)):
-    quest = db.query(Quest).filter(Quest.id == quest_id).first()
+    quest = db.get(Quest, quest_id)
     if not quest:
         raise HTTPException(status_code=404, detail="Quest not found")
     return quest
 
 @router.put("/{quest_id}", response_model=QuestResponse)
 def update_quest(quest_id: int, quest: QuestCreate, db: Session = Depends(get_db)):
-    db_quest = db.query(Quest).filter(Quest.id == quest_id).first()
+    db_quest = db.get(Quest, quest_id)
     if not db_quest:
         raise HTTPException(status_code=404, detail="Quest not found")
     
@@ -42,7 +42,7 @@ def update_quest(quest_id: int, quest: QuestCreate, db: Session = Depends(get_db
 
 @router.delete("/{quest_id}")
 def delete_quest(quest_id: int, db: Session = Depends(get_db)):
-    quest = db.query(Quest).filter(Quest.id == quest_id).first()
+    quest = db.get(Quest, quest_id)
     if not quest:
         raise HTTPException(status_code=404, detail="Quest not found")
     
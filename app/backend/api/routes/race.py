@@ -22,14 +22,14 @@ def get_races(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
 
 @router.get("/{race_id}", response_model=RaceResponse)
 def get_race(race_id: int, db: Session = Depends(get_db)):
-    race = db.query(Race).filter(Race.id == race_id).first()
+    race = db.get(Race, race_id)
     if not race:
         raise HTTPException(status_code=404, detail="Race not found")
     return race
 
 @router.put("/{race_id}", response_model=RaceResponse)
 def update_race(race_id: int, race: RaceCreate, db: Session = Depends(get_db)):
-    db_race = db.query(Race).filter(Race.id == race_id).first()
+    db_race = db.get(Race, race_id)
     if not db_race:
         raise HTTPException(status_code=404, detail="Race not found")
     
@@ -42,7 +42,7 @@ def update_race(race_id: int, race: RaceCreate, db: Session = Depends(get_db)):
 
 @router.delete("/{race_id}")
 def delete_race(race_id: int, db: Session = Depends(get_db)):
-    db_race = db.query(Race).filter(Race.id == race_id).first()
+    db_race = db.get(Race, race_id)
     if not db_race:
         raise HTTPException(status_code=404, detail="Race not found")
     
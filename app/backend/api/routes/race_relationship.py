@@ -22,7 +22,7 @@ def get_race_relationships(skip: int = 0, limit: int = 100, db: Session = Depend
 
 @router.get("/{relationship_id}", response_model=RaceRelationshipResponse)
 def get_race_relationship(relationship_id: int, db: Session = Depends(get_db)):
-    relationship = db.query(RaceRelationship).filter(RaceRelationship.id == relationship_id).first()
+    relationship = db.get(RaceRelationship, relationship_id)
     if not relationship:
         raise HTTPException(status_code=404, detail="Race relationship not found")
     return relationship
@@ -39,7 +39,7 @@ def get_race_relationship_between(race_source_id: int, race_target_id: int, db:
 
 @router.put("/{relationship_id}", response_model=RaceRelationshipResponse)
 def update_race_relationship(relationship_id: int, relationship: RaceRelationshipCreate, db: Session = Depends(get_db)):
-    db_relationship = db.query(RaceRelationship).filter(RaceRelationship.id == relationship_id).first()
+    db_relationship = db.get(RaceRelationship, relationship_id)
     if not db_relationship:
         raise HTTPException(status_code=404, detail="Race relationship not found")
     
@@ -52,7 +52,7 @@ def update_race_relationship(relationship_id: int, relationship: RaceRelationshi
 
 @router.delete("/{relationship_id}")
 def delete_race_relationship(relationship_id: int, db: Session = Depends(get_db)):
-    db_relationship = db.query(RaceRelationship).filter(RaceRelationship.id == relationship_id).first()
+    db_relationship = db.get(RaceRelationship, relationship_id)
     if not db_relationship:
         raise HTTPException(status_code=404, detail="Race relationship not found")
     
@@ -50,7 +50,7 @@ def get_regions(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
 @router.get("/{region_id}", response_model=RegionResponse)
 def get_region(region_id: int, db: Session = Depends(get_db)):
     """Get a specific region by ID."""
-    region = db.query(Region).filter(Region.id == region_id).first()
+    region = db.get(Region, region_id)
     if not region:
         raise HTTPException(status_code=404, detail="Region not found")
     return region
@@ -59,7 +59,7 @@ def get_region(region_id: int, db: Session = Depends(get_db)):
 @router.get("/{region_id}/locations")
 def get_region_locations(region_id: int, db: Session = Depends(get_db)):
     """Get all locations within a region."""
-    region = db.query(Region).filter(Region.id == region_id).first()
+    region = db.get(Region, region_id)
     if not region:
         raise HTTPException(status_code=404, detail="Region not found")
     
@@ -77,7 +77,7 @@ def get_region_locations(region_id: int, db: Session = Depends(get_db)):
 @router.put("/{region_id}", response_model=RegionResponse)
 def update_region(region_id: int, region: RegionUpdate, db: Session = Depends(get_db)):
     """Update a region."""
-    db_region = db.query(Region).filter(Region.id == region_id).first()
+    db_region = db.get(Region, region_id)
     if not db_region:
         raise HTTPException(status_code=404, detail="Region not found")
     
@@ -113,7 +113,7 @@ def update_region(region_id: int, region: RegionUpdate, db: Session = Depends(ge
 @router.delete("/{region_id}")
 def delete_region(region_id: int, db: Session = Depends(get_db)):
     """Delete a region."""
-    region = db.query(Region).filter(Region.id == region_id).first()
+    region = db.get(Region, region_id)
     if not region:
         raise HTTPException(status_code=404, detail="Region not found")
     
@@ -38,6 +38,10 @@ class Settings(BaseSettings):
     TTS_NARRATOR_VOICE: str = "Charon"                 # Male, informative narrator
     TTS_CHARACTER_VOICE_FEMALE: str = "Aoede"           # Default female NPC voice
     TTS_CHARACTER_VOICE_MALE: str = "Puck"              # Default male NPC voice
+    TTS_MAX_PARALLEL_BATCHES: int = 4                  # Gemini TTS calls in flight per narration
+
+    # Database
+    DB_LOCK_TIMEOUT_MS: int = 5000          # Fail a statement waiting this long on a row lock (0 = wait forever)
 
     # Session management
     MIN_MESSAGES_IN_SESSION: int = 15       # Keep at least this many messages in active session
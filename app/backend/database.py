@@ -1,15 +1,121 @@
-from sqlalchemy import create_engine
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional, Tuple
+
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from config import settings
 
-engine = create_engine(settings.DATABASE_URL)
+engine = create_engine(
+    settings.DATABASE_URL,
+    pool_size=20,
+    max_overflow=40,
+    pool_pre_ping=True,
+    # psycopg2: batch executemany INSERTs into multi-row VALUES and UPDATE/DELETEs
+    # with execute_batch (psycopg2 has no server-side prepared statements)
+    executemany_mode="values_plus_batch",
+    # A statement blocked on a row lock errors out after DB_LOCK_TIMEOUT_MS instead of
+    # stalling its request; tool steps commit before the next LLM call, so locks are short-lived
+    connect_args={"options": f"-c lock_timeout={settings.DB_LOCK_TIMEOUT_MS}"},
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Same pool; connections run without BEGIN/COMMIT (read-only session_scope units)
+_autocommit_engine = engine.execution_options(isolation_level="AUTOCOMMIT")
 Base = declarative_base()
 
+# Session shared by every tool call of the current ToolNode step (see tool_step_scope).
+# ToolNode may run parallel tool calls in worker threads that inherit this
+# context, so the session is paired with a lock that serializes its use.
+_step_session: ContextVar[Optional[Tuple[Session, threading.RLock]]] = ContextVar(
+    "step_session", default=None
+)
+
+def _hold_for_step(session: Session, instance) -> None:
+    # The identity map is weak-referencing; keep step objects alive between tool calls
+    session.info.setdefault("step_objects", set()).add(instance)
+
+def current_step_session() -> Optional[Session]:
+    """The session of the tool step this code runs in, if any (see tool_step_scope)."""
+    shared = _step_session.get()
+    return shared[0] if shared is not None else None
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+@contextmanager
+def tool_step_scope() -> Iterator[Session]:
+    """Open one session and transaction for one step of tool calls.
+
+    Every session_scope() entered inside this block reuses the same session,
+    so the tool calls the LLM requested together check out a single pooled
+    connection instead of one each. They run in SAVEPOINTs and the step commits
+    once when the block exits (rolled back if it raises), before control goes
+    back to the LLM: no transaction or row lock is held across an LLM call.
+    Objects are not expired on commit and are strongly referenced until the step
+    ends: a row loaded by one tool call (typically the acting player) is served
+    from the identity map by db.get() in later calls without another SELECT.
+    """
+    db = SessionLocal(expire_on_commit=False)
+    event.listen(db, "loaded_as_persistent", _hold_for_step)
+    event.listen(db, "pending_to_persistent", _hold_for_step)
+    token = _step_session.set((db, threading.RLock()))
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        _step_session.reset(token)
+        db.close()
+
+
+@contextmanager
+def session_scope(read_only: bool = False) -> Iterator[Session]:
+    """Transactional session for a single unit of work (e.g. one tool call).
+
+    Commits once when the block exits normally and rolls back on an exception,
+    so callers don't commit themselves. Inside tool_step_scope() this uses the
+    step's shared session and only releases a SAVEPOINT (rolled back on an
+    exception); the step's transaction commits when tool_step_scope() exits.
+    Otherwise it opens a fresh session and closes it on exit.
+
+    read_only=True is for units that only SELECT: outside a step the session
+    runs on an autocommit connection (no BEGIN/COMMIT round trips). Inside a
+    step the unit still gets its SAVEPOINT, so a failing read (e.g. an invalid
+    enum value from the LLM) can't abort the step's transaction and its writes.
+    """
+    shared = _step_session.get()
+    if shared is None:
+        db = SessionLocal(bind=_autocommit_engine) if read_only else SessionLocal()
+        try:
+            yield db
+            if not read_only:
+                db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        return
+
+    db, lock = shared
+    with lock:
+        savepoint = db.begin_nested()
+        try:
+            yield db
+        except Exception:
+            # Undo only this unit of work; earlier tool calls of the step stay pending
+            if savepoint.is_active:
+                savepoint.rollback()
+            raise
+        # A unit that committed the shared session explicitly has already ended the savepoint
+        if savepoint.is_active:
+            savepoint.commit()
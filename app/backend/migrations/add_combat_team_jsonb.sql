@@ -0,0 +1,9 @@
+-- Migration: Store combat teams as JSONB and index them for containment lookups
+-- Run this if you have an existing database (new databases get this from the models)
+
+ALTER TABLE combat_session ALTER COLUMN team_player TYPE JSONB USING team_player::jsonb;
+ALTER TABLE combat_session ALTER COLUMN team_enemy TYPE JSONB USING team_enemy::jsonb;
+
+-- Combats a character takes part in: team @> '[{"type": "NPC", "id": 5}]' (update_npc_health)
+CREATE INDEX IF NOT EXISTS ix_combat_session_team_player ON combat_session USING gin (team_player jsonb_path_ops);
+CREATE INDEX IF NOT EXISTS ix_combat_session_team_enemy ON combat_session USING gin (team_enemy jsonb_path_ops);
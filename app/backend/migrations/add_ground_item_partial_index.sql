@@ -0,0 +1,6 @@
+-- Migration: Replace the (location_id, owner_type) item index with a partial index on ground items
+-- Run this if you have an existing database (new databases get this from the models)
+
+-- Only owner_type = 'NONE' rows are ever looked up by location (get_items_at_location, get_location_info)
+CREATE INDEX IF NOT EXISTS ix_item_instance_ground ON item_instance(location_id) WHERE owner_type = 'NONE';
+DROP INDEX IF EXISTS ix_item_instance_location;
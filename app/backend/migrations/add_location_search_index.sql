@@ -0,0 +1,7 @@
+-- Migration: Trigram index for list_locations substring search
+-- Run this if you have an existing database (new databases get this from the models)
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- name/description ILIKE '%term%' (list_locations)
+CREATE INDEX IF NOT EXISTS ix_location_search_trgm ON location USING gin (name gin_trgm_ops, description gin_trgm_ops);
@@ -0,0 +1,41 @@
+-- Migration: Add indexes matching the WHERE predicates used by the GM agent tools
+-- Run this if you have an existing database (new databases get these from the models)
+
+-- Inventory lookups (get_player_inventory, get_npc_inventory, get_player_info)
+CREATE INDEX IF NOT EXISTS ix_item_instance_owner ON item_instance(owner_type, owner_id);
+
+-- Items on the ground (get_items_at_location, get_location_info)
+CREATE INDEX IF NOT EXISTS ix_item_instance_location ON item_instance(location_id, owner_type);
+
+-- Instances of a template (GET /item-instances?template_id=, FK check when a template is deleted)
+CREATE INDEX IF NOT EXISTS ix_item_instance_template ON item_instance(template_id);
+
+-- NPCs at a location (get_npcs_at_location, get_location_info) and companions (move_player, get_player_companions)
+CREATE INDEX IF NOT EXISTS ix_non_player_character_location_id ON non_player_character(location_id);
+CREATE INDEX IF NOT EXISTS ix_non_player_character_following_player_id ON non_player_character(following_player_id);
+
+-- Quest log (get_player_quests)
+CREATE INDEX IF NOT EXISTS ix_quest_player_id ON quest(player_id);
+
+-- Canonical relationship pair (get_relationship, update_relationship)
+-- Note: fails if duplicate pairs already exist; remove duplicates first.
+CREATE UNIQUE INDEX IF NOT EXISTS uq_character_relationship_pair ON character_relationship(
+    source_character_type, source_character_id, target_character_type, target_character_id
+);
+
+-- Relationships where a character is the target (GET /relationships/character/{type}/{id})
+CREATE INDEX IF NOT EXISTS ix_character_relationship_target ON character_relationship(target_character_type, target_character_id);
+
+-- Race relationship pair (update_race_relationship upserts on it)
+-- Note: fails if duplicate pairs already exist; remove duplicates first.
+CREATE UNIQUE INDEX IF NOT EXISTS uq_race_relationship_pair ON race_relationship(race_source_id, race_target_id);
+
+-- Case-insensitive race names (create_race inserts ON CONFLICT on it)
+-- Note: fails if names differing only in case already exist; rename them first.
+CREATE UNIQUE INDEX IF NOT EXISTS ix_race_name_lower ON race(lower(name));
+
+-- A player's active combat (every combat tool): partial index over the active rows only
+CREATE INDEX IF NOT EXISTS ix_combat_session_active ON combat_session(player_id) WHERE status = 'active';
+
+-- Relationships where a race is the target (get_race_relationships(race_id))
+CREATE INDEX IF NOT EXISTS ix_race_relationship_target ON race_relationship(race_target_id);
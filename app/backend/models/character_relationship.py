@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Enum as SQLEnum, DateTime, CheckConstraint
+from sqlalchemy import Column, Integer, String, Text, Enum as SQLEnum, DateTime, CheckConstraint, UniqueConstraint, Index
 from sqlalchemy.sql import func
 from database import Base
 import enum
@@ -39,4 +39,12 @@ class CharacterRelationship(Base):
             '(source_character_type != target_character_type) OR (source_character_id != target_character_id)',
             name='check_different_characters'
         ),
+        # One row per canonical (source, target) pair - backs get/update_relationship lookups
+        UniqueConstraint(
+            'source_character_type', 'source_character_id',
+            'target_character_type', 'target_character_id',
+            name='uq_character_relationship_pair'
+        ),
+        # Target side of "all relationships of a character" (source side uses the pair's prefix)
+        Index('ix_character_relationship_target', 'target_character_type', 'target_character_id'),
     )
@@ -4,7 +4,8 @@ Combat Session model for tracking team-based combat encounters.
 Stores two teams with participant stats, combat status, and generates
 summaries when combat ends.
 """
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from database import Base
 
@@ -22,10 +23,10 @@ class CombatSession(Base):
     # Description of the combat encounter
     description = Column(Text)
     
-    # Teams as JSON arrays with full stats for context
+    # Teams as JSONB arrays with full stats for context
     # Format: [{"type": "PC"|"NPC", "id": int, "name": str, "hp": int, "max_hp": int, "role": str}]
-    team_player = Column(JSON, default=list)  # Player's side (PC + companions + allies)
-    team_enemy = Column(JSON, default=list)   # Enemy side
+    team_player = Column(JSONB, default=list)  # Player's side (PC + companions + allies)
+    team_enemy = Column(JSONB, default=list)   # Enemy side
     
     # Combat outcome when ended
     outcome = Column(String(50))  # victory, defeat, fled, negotiated, interrupted
@@ -37,15 +38,32 @@ class CombatSession(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     ended_at = Column(DateTime(timezone=True))
     
+    __table_args__ = (
+        # A player's active combat (every combat tool): partial index holding only the
+        # active rows, so ended combats piling up per player don't widen the probe
+        Index("ix_combat_session_active", "player_id", postgresql_where=text("status = 'active'")),
+        # Combats a character is in: team @> '[{"type": ..., "id": ...}]' (update_npc_health)
+        Index("ix_combat_session_team_player", "team_player",
+              postgresql_using="gin", postgresql_ops={"team_player": "jsonb_path_ops"}),
+        Index("ix_combat_session_team_enemy", "team_enemy",
+              postgresql_using="gin", postgresql_ops={"team_enemy": "jsonb_path_ops"}),
+    )
+    
+    def find_combatant(self, char_type: str, char_id: int) -> tuple[str, int] | None:
+        """Locate a combatant: (team attribute name, index in that team's list)."""
+        for team in ("team_player", "team_enemy"):
+            for i, member in enumerate(getattr(self, team) or []):
+                if member.get("id") == char_id and member.get("type") == char_type:
+                    return team, i
+        return None
+    
     def get_combatant(self, char_type: str, char_id: int) -> dict | None:
         """Find a combatant in either team."""
-        for member in (self.team_player or []):
-            if member.get("type") == char_type and member.get("id") == char_id:
-                return member
-        for member in (self.team_enemy or []):
-            if member.get("type") == char_type and member.get("id") == char_id:
-                return member
-        return None
+        found = self.find_combatant(char_type, char_id)
+        if found is None:
+            return None
+        team, i = found
+        return getattr(self, team)[i]
     
     def is_active(self) -> bool:
         return self.status == "active"
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Enum as SQLEnum, JSON
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Enum as SQLEnum, JSON, Index, text
+from sqlalchemy.orm import relationship
 from database import Base
 import enum
 
@@ -12,7 +13,11 @@ class ItemInstance(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     template_id = Column(Integer, ForeignKey("item_template.id"), nullable=False)
+    # Never lazy-loaded: queries that need it eager-load it (joinedload), so a
+    # forgotten option fails loudly instead of issuing one SELECT per item
+    template = relationship("ItemTemplate", lazy="raise")
     
+    # Native PostgreSQL ENUM: stored as a 4-byte value, not a string
     owner_type = Column(SQLEnum(OwnerType), default=OwnerType.NONE)
     owner_id = Column(Integer, nullable=True)
     location_id = Column(Integer, ForeignKey("location.id"), nullable=True)
@@ -27,3 +32,12 @@ class ItemInstance(Base):
     buffs = Column(JSON, default=list)  # e.g., ["sharp: +2 damage", "lightweight"]
     flaws = Column(JSON, default=list)  # e.g., ["rusty: -1 durability", "chipped"]
     enchantments = Column(JSON, default=list)  # e.g., ["fire: +5 fire damage", "glowing: emits light"]
+    
+    __table_args__ = (
+        # Inventory lookups: owner_type + owner_id (get_player_inventory, get_npc_inventory)
+        Index("ix_item_instance_owner", "owner_type", "owner_id"),
+        # Ground items: partial index holding only owner_type=NONE rows (get_items_at_location)
+        Index("ix_item_instance_ground", "location_id", postgresql_where=text("owner_type = 'NONE'")),
+        # Instances of a template (GET /item-instances?template_id=, FK check when a template is deleted)
+        Index("ix_item_instance_template", "template_id"),
+    )
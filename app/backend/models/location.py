@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Index, DDL, event
 from database import Base
 
 
@@ -21,3 +21,16 @@ class Location(Base):
     population_density = Column(String(20), nullable=True)  # sparse, moderate, dense, crowded
     accessibility = Column(String(20), nullable=True)  # public, restricted, hidden, secret
     notes = Column(Text, nullable=True)  # GM notes about this location
+    
+    __table_args__ = (
+        # Substring search on name/description (list_locations ILIKE '%term%')
+        Index("ix_location_search_trgm", "name", "description", postgresql_using="gin",
+              postgresql_ops={"name": "gin_trgm_ops", "description": "gin_trgm_ops"}),
+    )
+
+
+# Trigram operator classes come from pg_trgm, which must exist before the index
+event.listen(
+    Location.__table__, "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
@@ -21,11 +21,11 @@ class NonPlayerCharacter(Base):
     base_disposition = Column(Integer, default=0)
     description = Column(Text)
     dialogue = Column(Text)
-    location_id = Column(Integer, ForeignKey("location.id"))
+    location_id = Column(Integer, ForeignKey("location.id"), index=True)
     race_id = Column(Integer, ForeignKey("race.id"))
     faction_id = Column(Integer, ForeignKey("faction.id"))
     personality_traits = Column(JSON, default=dict)
     # Companion system: if set, this NPC follows the player and moves with them
-    following_player_id = Column(Integer, ForeignKey("player_character.id"), nullable=True)
+    following_player_id = Column(Integer, ForeignKey("player_character.id"), nullable=True, index=True)
     # TTS voice name (auto-assigned on first TTS, reused for consistency)
     voice = Column(String(50), nullable=True)
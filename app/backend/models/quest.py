@@ -11,4 +11,4 @@ class Quest(Base):
     is_active = Column(Boolean, default=False)
     reward_gold = Column(Integer, default=0)
     reward_experience = Column(Integer, default=0)
-    player_id = Column(Integer, ForeignKey("player_character.id"))
+    player_id = Column(Integer, ForeignKey("player_character.id"), index=True)
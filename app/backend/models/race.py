@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text
+from sqlalchemy import Column, Integer, String, Text, Index, func
 from database import Base
 
 class Race(Base):
@@ -7,3 +7,8 @@ class Race(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(50), nullable=False, unique=True)
     description = Column(Text)
+    
+    __table_args__ = (
+        # Case-insensitive uniqueness: conflict target of create_race's insert
+        Index("ix_race_name_lower", func.lower(name), unique=True),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, CheckConstraint
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, CheckConstraint, UniqueConstraint, Index
 from database import Base
 
 class RaceRelationship(Base):
@@ -13,4 +13,8 @@ class RaceRelationship(Base):
     __table_args__ = (
         CheckConstraint('base_relationship_modifier >= -100 AND base_relationship_modifier <= 100', 
                        name='check_race_relationship_range'),
+        # One row per (source, target) pair: conflict target of update_race_relationship's upsert
+        UniqueConstraint('race_source_id', 'race_target_id', name='uq_race_relationship_pair'),
+        # Target side of get_race_relationships(race_id) (source side uses the pair's prefix)
+        Index('ix_race_relationship_target', 'race_target_id'),
     )
@@ -0,0 +1,157 @@
+import pytest
+from sqlalchemy import Column, Integer, create_engine, event
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
+
+from agents import tool_cache
+from agents.tool_cache import (
+    TTLCache, cached_result, drop_on_commit, invalidate_on_write, load_committed, tool_results
+)
+
+Base = declarative_base()
+
+
+class Row(Base):
+    __tablename__ = "rows"
+    id = Column(Integer, primary_key=True)
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://")
+
+    # Let SQLAlchemy, not pysqlite, emit BEGIN so SAVEPOINTs behave
+    @event.listens_for(engine, "connect")
+    def _no_implicit_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    invalidate_on_write(factory)
+    yield factory
+    engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def empty_tool_results():
+    tool_results.invalidate()
+    yield
+    tool_results.invalidate()
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(tool_cache.time, "monotonic", lambda: now[0])
+    cache = TTLCache(ttl=10)
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return "value"
+
+    assert cache.get_or_load("k", loader) == "value"
+    now[0] += 9
+    assert cache.get_or_load("k", loader) == "value"
+    assert len(loads) == 1
+    now[0] += 2
+    assert cache.get_or_load("k", loader) == "value"
+    assert len(loads) == 2
+
+
+def test_misses_are_not_cached():
+    cache = TTLCache()
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return None
+
+    assert cache.get_or_load("k", loader) is None
+    assert cache.get_or_load("k", loader) is None
+    assert len(loads) == 2
+
+
+def test_load_committed_bypasses_cache_while_session_wrote(session_factory):
+    cache = TTLCache()
+    cache.get_or_load("k", lambda: "committed")
+    with session_factory() as db:
+        db.add(Row(id=1))
+        db.flush()
+        assert load_committed(cache, db, "k", lambda: "pending") == "pending"
+        assert load_committed(cache, db, "other", lambda: "pending") == "pending"
+        db.rollback()
+        assert load_committed(cache, db, "k", lambda: "pending") == "committed"
+    assert cache.get_or_load("other", lambda: None) is None
+
+
+def test_cached_result_bypasses_cache_while_step_wrote(monkeypatch):
+    calls = []
+
+    @cached_result
+    def read_tool(x):
+        calls.append(x)
+        return {"x": x}
+
+    step_db = Session()
+    monkeypatch.setattr(tool_cache, "current_step_session", lambda: step_db)
+    read_tool(1)
+    read_tool(1)
+    assert calls == [1]
+
+    step_db.info["wrote"] = True
+    read_tool(1)
+    read_tool(2)
+    assert calls == [1, 1, 2]
+    assert ("read_tool", (2,), frozenset()) not in tool_results._entries
+
+
+def test_write_and_commit_drop_tool_results(session_factory):
+    tool_results.get_or_load("key", lambda: "old")
+    with session_factory() as db:
+        db.add(Row(id=1))
+        db.flush()
+        assert tool_results._entries == {}
+        # Another thread re-caches the committed state before this commit
+        tool_results.get_or_load("key", lambda: "old")
+        db.commit()
+        assert tool_results._entries == {}
+        assert "wrote" not in db.info
+
+
+def test_rollback_drops_tool_results(session_factory):
+    with session_factory() as db:
+        db.add(Row(id=1))
+        db.flush()
+        tool_results.get_or_load("key", lambda: "pending")
+        db.rollback()
+        assert tool_results._entries == {}
+        assert "wrote" not in db.info
+
+
+def test_savepoint_end_keeps_wrote_flag(session_factory):
+    with session_factory() as db:
+        db.add(Row(id=1))
+        db.flush()
+        with db.begin_nested():
+            db.add(Row(id=2))
+        nested = db.begin_nested()
+        db.add(Row(id=3))
+        db.flush()
+        nested.rollback()
+        assert db.info.get("wrote")
+        db.commit()
+        assert "wrote" not in db.info
+
+
+def test_drop_on_commit_drops_key_again_on_commit(session_factory):
+    cache = TTLCache()
+    cache.get_or_load("k", lambda: "old")
+    with session_factory() as db:
+        drop_on_commit(db, cache, "k")
+        assert cache.get_or_load("k", lambda: "old") == "old"
+        db.add(Row(id=1))
+        db.commit()
+    assert cache.get_or_load("k", lambda: "new") == "new"